@@ -4,12 +4,27 @@ import shutil
 from pathlib import Path
 
 import click
-from rich.console import Console
-from rich.table import Table
 
-from .config import load_config, DEFAULT_CONFIG
+from .config import load_config, clear_config_cache, DEFAULT_CONFIG
 
-console = Console()
+
+class _LazyConsole:
+    """Defers importing and constructing rich's Console until first use."""
+
+    _console = None
+
+    def get(self):
+        """Return the real Console, for APIs that need one (e.g. Live)."""
+        if self._console is None:
+            from rich.console import Console
+            type(self)._console = Console()
+        return self._console
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+console = _LazyConsole()
 
 
 @click.group()
@@ -72,6 +87,7 @@ def init(ctx, path):
         )
         config_text = header + config_text
         config_file.write_text(config_text)
+        clear_config_cache()
         console.print(f"  Created config: {config_file}")
 
     # Copy ontology
@@ -165,6 +181,7 @@ def embed(ctx):
 @click.pass_context
 def search(ctx, query, n, since):
     """Semantic search over the knowledge vault."""
+    from rich.table import Table
     from .query.search import semantic_search
 
     config = _get_config(ctx)
@@ -318,7 +335,8 @@ def stats(ctx):
 @click.pass_context
 def ask(ctx, question, n, since):
     """Ask a question and get an AI-synthesized answer from your vault."""
-    from .qa import ask_question
+    from .qa import ask_question_stream
+    from rich.live import Live
     from rich.markdown import Markdown
     from rich.panel import Panel
 
@@ -329,18 +347,22 @@ def ask(ctx, question, n, since):
     console.print()
 
     try:
-        result = ask_question(question, config, n_chunks=n, since=since)
+        chunks, sources = ask_question_stream(question, config, n_chunks=n, since=since)
     except ValueError as e:
         console.print(f"[red]{e}[/]")
         return
 
-    # Print answer
-    console.print(Panel(Markdown(result["answer"]), title="Answer", border_style="green"))
+    # Print answer as it streams in
+    answer = ""
+    with Live(console=console.get(), refresh_per_second=8) as live:
+        for text in chunks:
+            answer += text
+            live.update(Panel(Markdown(answer), title="Answer", border_style="green"))
 
     # Print sources
-    if result["sources"]:
+    if sources:
         console.print("\n[bold]📚 Sources:[/]")
-        for title in result["sources"]:
+        for title in sources:
             console.print(f"  • [[{title}]]")
 
 
@@ -405,6 +427,7 @@ def _run_sync_if_enabled(config: dict):
 def list_docs(ctx, since):
     """List all unique documents in the vault (by title and date)."""
     from datetime import datetime, timedelta
+    from rich.table import Table
 
     config = _get_config(ctx)
     from .storage import get_vector_store
@@ -484,8 +507,16 @@ def sync_chroma(ctx, host, dest, dry_run):
 
     target = f"{remote_host}:{remote_dest}"
     cmd = [
-        "rsync", "-az", "--delete",
-        "--progress",
+        "rsync", "-a", "--delete",
+        # Chroma's SQLite/HNSW files change wholesale, so the delta algorithm is wasted work
+        "--whole-file",
+        "--info=progress2",
+        # AES-GCM uses AES-NI; rsync handles compression itself
+        "-e", "ssh -o Compression=no -c aes128-gcm@openssh.com",
+    ]
+    if not remote_cfg.get("lan", False):
+        cmd += ["--compress", "--compress-choice=zstd", "--compress-level=3"]
+    cmd += [
         "--exclude", "ingest/",  # no need to sync pending ingestion files
         str(local_pkv) + "/",
         target + "/",
@@ -524,44 +555,79 @@ def sync_bq(ctx, collection):
         project=bq_cfg.get("project", "ozpr-reporting-dev"),
         dataset=bq_cfg.get("dataset", "dbt_oriol"),
         table=bq_cfg.get("table", "pkv_oriol"),
+        quantize=bq_cfg.get("quantize", False),
+        write_api=bq_cfg.get("write_api", False),
+        cache_dir=bq_cfg.get("cache_dir", "~/.cache/pkv"),
     )
 
-    console.print(f"[blue]Reading all documents from ChromaDB...[/]")
-    data = chroma.get_all(collection)
-    total = len(data["ids"])
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    console.print(f"[blue]Reading all document IDs from ChromaDB...[/]")
+    all_ids = sorted(chroma.get_all_ids(collection))
+    total = len(all_ids)
     console.print(f"  Found {total} chunks")
 
     if total == 0:
         console.print("[yellow]Nothing to sync.[/]")
         return
 
-    # Get embeddings too
-    import numpy as np
-    all_data = chroma.get_by_ids(collection, data["ids"], include=["documents", "metadatas", "embeddings"])
-    # Convert numpy arrays to plain lists for JSON serialization
-    if "embeddings" in all_data and len(all_data["embeddings"]) > 0:
-        all_data["embeddings"] = [
-            e.tolist() if isinstance(e, np.ndarray) else list(e)
-            for e in all_data["embeddings"]
-        ]
-
     batch_size = 500
-    synced = 0
-    for i in range(0, total, batch_size):
-        batch_end = min(i + batch_size, total)
+    max_workers = 4
+
+    def batches():
+        """Fetch one batch at a time from ChromaDB so memory stays bounded."""
+        for i in range(0, total, batch_size):
+            yield chroma.get_by_ids(
+                collection, all_ids[i:i + batch_size],
+                include=["documents", "metadatas", "embeddings"],
+            )
+
+    def upload(batch) -> int:
         bq.add_documents(
             collection_name=collection,
-            ids=all_data["ids"][i:batch_end],
-            embeddings=all_data["embeddings"][i:batch_end],
-            documents=all_data["documents"][i:batch_end],
-            metadatas=all_data["metadatas"][i:batch_end],
+            ids=batch["ids"],
+            embeddings=batch["embeddings"],
+            documents=batch["documents"],
+            metadatas=batch["metadatas"],
         )
-        synced += batch_end - i
-        console.print(f"  [green]Synced {synced}/{total}[/]")
+        return len(batch["ids"])
+
+    # Overlap uploads (I/O-bound) with fetching the next batches, keeping at
+    # most 2 * max_workers batches in flight
+    synced = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = set()
+        for batch in batches():
+            pending.add(pool.submit(upload, batch))
+            if len(pending) >= max_workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for f in done:
+                    synced += f.result()
+                    console.print(f"  [green]Synced {synced}/{total}[/]")
+        for f in pending:
+            synced += f.result()
+            console.print(f"  [green]Synced {synced}/{total}[/]")
 
     console.print(f"\n[green]✓ All {total} chunks synced to BigQuery ({bq.full_table})[/]")
 
 
+@cli.command()
+@click.pass_context
+def daemon(ctx):
+    """Keep the embedding model loaded and serve other pkv commands over a local socket."""
+    from .daemon import serve, socket_path
+
+    config = _get_config(ctx)
+    console.print(f"[blue]Loading {config.get('embedding_model')}...[/]")
+    console.print(f"[bold]Serving embeddings on {socket_path(config)} (Ctrl+C to stop)[/]")
+    try:
+        serve(config)
+    except RuntimeError as e:
+        console.print(f"[yellow]{e}[/]")
+    except KeyboardInterrupt:
+        console.print("\n[green]✓ Daemon stopped.[/]")
+
+
 @cli.command()
 @click.option("--enrich/--no-enrich", default=True, help="Run enrichment (default: on, use --no-enrich to skip)")
 @click.option("--debounce", default=5.0, help="Seconds to wait after last change before processing")
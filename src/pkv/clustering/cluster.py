@@ -1,4 +1,8 @@
-"""OPTICS clustering of document embeddings."""
+"""OPTICS clustering of document embeddings.
+
+Large vaults switch to an approximate path: a kNN graph built with HNSW
+(hnswlib, optional) clustered by HDBSCAN on the sparse distance graph.
+"""
 
 import numpy as np
 from typing import Any
@@ -10,17 +14,18 @@ from ..models import ClusterResult
 def run_clustering(config: dict[str, Any]) -> list[ClusterResult]:
     """Run OPTICS clustering on all document embeddings.
 
+    Above ``clustering.ann_threshold`` embeddings, uses HNSW + HDBSCAN instead
+    when hnswlib is installed.
+
     Returns list of ClusterResult objects.
     """
-    from sklearn.cluster import OPTICS
-
     store = get_vector_store(config)
     data = store.get_all("documents")
 
     if data["ids"] is None or len(data["ids"]) == 0 or data["embeddings"] is None or len(data["embeddings"]) == 0:
         return []
 
-    embeddings = np.array(data["embeddings"])
+    embeddings = np.ascontiguousarray(data["embeddings"], dtype=np.float32)
     ids = data["ids"]
     metadatas = data["metadatas"] or [{}] * len(ids)
 
@@ -31,35 +36,109 @@ def run_clustering(config: dict[str, Any]) -> list[ClusterResult]:
     min_samples = cluster_cfg.get("min_samples", 3)
     xi = cluster_cfg.get("xi", 0.05)
     min_cluster_size = cluster_cfg.get("min_cluster_size", 3)
+    ann_threshold = cluster_cfg.get("ann_threshold", 5000)
 
     # Adjust min_samples if we have fewer points
     min_samples = min(min_samples, len(embeddings))
 
-    optics = OPTICS(
-        min_samples=min_samples,
-        xi=xi,
-        min_cluster_size=min_cluster_size,
-        metric="cosine",
-    )
-    labels = optics.fit_predict(embeddings)
-
-    # Group by cluster
-    clusters: dict[int, list[int]] = {}
-    for idx, label in enumerate(labels):
-        if label == -1:  # noise
-            continue
-        clusters.setdefault(label, []).append(idx)
+    labels = None
+    if len(embeddings) > ann_threshold:
+        labels = _hnsw_labels(embeddings, min_samples, min_cluster_size)
+    if labels is None:
+        from sklearn.cluster import OPTICS
+
+        optics = OPTICS(
+            min_samples=min_samples,
+            xi=xi,
+            min_cluster_size=min_cluster_size,
+            metric="cosine",
+        )
+        labels = optics.fit_predict(embeddings)
+
+    # Group by cluster: stable argsort keeps members in index order, then
+    # split wherever the sorted label changes
+    labels = np.asarray(labels)
+    order = np.argsort(labels, kind="stable")
+    sorted_labels = labels[order]
+    splits = np.flatnonzero(np.diff(sorted_labels)) + 1
+    starts = np.concatenate(([0], splits))
 
     results = []
-    for cluster_id, member_indices in clusters.items():
+    for cluster_id, member_indices in zip(sorted_labels[starts], np.split(order, splits)):
+        if cluster_id == -1:  # noise
+            continue
         member_embeddings = embeddings[member_indices]
-        centroid = member_embeddings.mean(axis=0).tolist()
+        centroid = member_embeddings.mean(axis=0, dtype=np.float32).astype(np.float16)
         doc_ids = [ids[i] for i in member_indices]
 
         results.append(ClusterResult(
-            cluster_id=cluster_id,
+            cluster_id=int(cluster_id),
             document_ids=doc_ids,
             centroid=centroid,
+            embeddings=member_embeddings,
         ))
 
     return results
+
+
+def _knn_graph(neighbors: np.ndarray, distances: np.ndarray, k: int) -> "csr_matrix":
+    """Symmetric sparse kNN distance graph from (n, k + 1) query results.
+
+    Self-matches are masked by index rather than assumed to be column 0: with
+    exact-duplicate embeddings HNSW may return the duplicate first. Each row
+    keeps its first k other points, so a row that never found itself still
+    contributes exactly k edges.
+    """
+    from scipy.sparse import csr_matrix
+
+    n = len(neighbors)
+    not_self = neighbors != np.arange(n)[:, None]
+    keep = not_self & (np.cumsum(not_self, axis=1) <= k)
+    rows = np.nonzero(keep)[0]
+    # Keep distances strictly positive so duplicates aren't treated as
+    # missing entries in the sparse graph
+    dists = np.maximum(distances[keep], 1e-10)
+    graph = csr_matrix((dists, (rows, neighbors[keep])), shape=(n, n))
+    return graph.maximum(graph.T).tocsr()
+
+
+def _hnsw_labels(embeddings: np.ndarray, min_samples: int, min_cluster_size: int) -> np.ndarray | None:
+    """Cluster via an HNSW kNN graph + HDBSCAN on the sparse distance matrix.
+
+    Returns None when hnswlib is not installed, so the caller can fall back
+    to OPTICS.
+    """
+    try:
+        import hnswlib
+    except ImportError:
+        return None
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import connected_components
+    from sklearn.cluster import HDBSCAN
+
+    n, dim = embeddings.shape
+    k = min(n - 1, max(min_samples * 2, min_samples + 1))
+
+    index = hnswlib.Index(space="cosine", dim=dim)
+    index.init_index(max_elements=n, ef_construction=200, M=16)
+    index.set_ef(max(k * 2, 50))
+    index.add_items(embeddings)
+    neighbors, distances = index.knn_query(embeddings, k=k + 1)
+    graph = _knn_graph(neighbors, distances, k)
+
+    # HDBSCAN needs a connected graph; chain components together with
+    # maximal-distance edges so they separate at the top of the hierarchy
+    n_components, components = connected_components(graph, directed=False)
+    if n_components > 1:
+        reps = np.array([np.flatnonzero(components == c)[0] for c in range(n_components)])
+        bridge = csr_matrix(
+            (np.full(n_components - 1, 2.0), (reps[:-1], reps[1:])), shape=(n, n)
+        )
+        graph = graph.maximum(bridge).maximum(bridge.T).tocsr()
+
+    return HDBSCAN(
+        metric="precomputed",
+        min_samples=min_samples,
+        min_cluster_size=max(min_cluster_size, 2),
+        copy=True,
+    ).fit_predict(graph)
@@ -1,7 +1,6 @@
 """Extract and score relationships between documents from clusters."""
 
 import numpy as np
-from itertools import combinations
 from typing import Any
 
 from ..models import ClusterResult, Relationship
@@ -14,36 +13,54 @@ def extract_relationships(
 ) -> list[Relationship]:
     """Extract scored relationships from clusters.
 
-    For each cluster, compute pairwise similarity between members.
+    For each cluster, compute pairwise similarity between members. Clusters
+    produced by run_clustering carry their member embeddings; any others are
+    fetched from the store in a single call.
     """
-    store = get_vector_store(config)
-    relationships = []
+    # Fetch embeddings in one call for clusters that don't carry them
+    missing_ids = list({
+        doc_id
+        for c in clusters
+        if c.embeddings is None and len(c.document_ids) >= 2
+        for doc_id in c.document_ids
+    })
+    emb_map: dict[str, np.ndarray] = {}
+    if missing_ids:
+        store = get_vector_store(config)
+        result = store.get_by_ids("documents", missing_ids, include=["embeddings"])
+        if result["embeddings"] is not None and len(result["embeddings"]) > 0:
+            emb_map = dict(zip(result["ids"], np.asarray(result["embeddings"], dtype=np.float32)))
 
+    relationships = []
     for cluster in clusters:
-        if len(cluster.document_ids) < 2:
-            continue
+        if cluster.embeddings is not None:
+            ids = cluster.document_ids
+            embeddings = np.asarray(cluster.embeddings, dtype=np.float32)
+        else:
+            ids = [i for i in cluster.document_ids if i in emb_map]
+            if len(ids) < 2:
+                continue
+            embeddings = np.stack([emb_map[i] for i in ids])
 
-        # Get embeddings for cluster members
-        collection = store.get_or_create_collection("documents")
-        result = collection.get(ids=cluster.document_ids, include=["embeddings"])
-
-        if result["embeddings"] is None or len(result["embeddings"]) == 0:
+        if len(ids) < 2:
             continue
 
-        embeddings = np.array(result["embeddings"])
-        ids = result["ids"]
-
-        # Pairwise cosine similarity
-        for (i, id_a), (j, id_b) in combinations(enumerate(ids), 2):
-            sim = float(np.dot(embeddings[i], embeddings[j]) / (
-                np.linalg.norm(embeddings[i]) * np.linalg.norm(embeddings[j]) + 1e-8
-            ))
-            relationships.append(Relationship(
-                doc_a=id_a,
-                doc_b=id_b,
-                score=sim,
+        # Pairwise cosine similarity as one normalized matrix multiply
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-8
+        normalized = embeddings / norms
+        sims = normalized @ normalized.T
+        iu, ju = np.triu_indices(len(ids), k=1)
+        scores = sims[iu, ju]
+
+        relationships.extend(
+            Relationship(
+                doc_a=ids[i],
+                doc_b=ids[j],
+                score=float(s),
                 cluster_id=cluster.cluster_id,
-            ))
+            )
+            for i, j, s in zip(iu, ju, scores)
+        )
 
     # Sort by score descending
     relationships.sort(key=lambda r: r.score, reverse=True)
@@ -1,6 +1,10 @@
 """Configuration management for PKV."""
 
+import copy
+import json
 import os
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -13,18 +17,23 @@ DEFAULT_CONFIG = {
     "chroma_path": "~/.pkv/chroma",
     "embedding_model": "intfloat/e5-large-v2",
     "claude_model": "claude-sonnet-4-20250514",
-    "clustering": {"min_samples": 3, "xi": 0.05, "min_cluster_size": 3},
+    "clustering": {"min_samples": 3, "xi": 0.05, "min_cluster_size": 3, "ann_threshold": 5000},
     "chunking": {"max_tokens": 500, "overlap_tokens": 50, "respect_boundaries": True},
     "enrichment": {"max_clusters": 20, "max_docs_per_cluster": 10},
 }
 
 
 def _find_config_file() -> Path | None:
-    """Look for config.yaml in standard locations."""
+    """Look for config.yaml in standard locations (memoized per working directory)."""
+    return _find_config_file_in(str(Path.cwd()), str(Path.home()))
+
+
+@lru_cache(maxsize=8)
+def _find_config_file_in(cwd: str, home: str) -> Path | None:
     candidates = [
-        Path.cwd() / "config" / "config.yaml",
-        Path.cwd() / "config.yaml",
-        Path.home() / ".pkv" / "config.yaml",
+        Path(cwd) / "config" / "config.yaml",
+        Path(cwd) / "config.yaml",
+        Path(home) / ".pkv" / "config.yaml",
     ]
     for p in candidates:
         if p.exists():
@@ -33,17 +42,32 @@ def _find_config_file() -> Path | None:
 
 
 def load_config(config_path: str | Path | None = None) -> dict[str, Any]:
-    """Load configuration, merging defaults with file and env vars."""
-    cfg = dict(DEFAULT_CONFIG)
+    """Load configuration, merging defaults with file and env vars.
 
+    Results are memoized on (path, mtime, env, cwd); callers get their own copy.
+    """
     path = Path(config_path) if config_path else _find_config_file()
+    mtime_ns = path.stat().st_mtime_ns if path and path.exists() else 0
+    cfg = _load_config_cached(
+        str(path) if path else None,
+        mtime_ns,
+        os.environ.get("ANTHROPIC_API_KEY"),
+        str(Path.cwd()),
+    )
+    return copy.deepcopy(cfg)
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(path_str: str | None, mtime_ns: int, api_key: str | None, cwd: str) -> dict[str, Any]:
+    cfg = dict(DEFAULT_CONFIG)
+
+    path = Path(path_str) if path_str else None
     if path and path.exists():
-        with open(path) as f:
-            file_cfg = yaml.safe_load(f) or {}
+        file_cfg = _load_yaml_cached(path) or {}
         _deep_merge(cfg, file_cfg)
 
     # Env overrides
-    if api_key := os.environ.get("ANTHROPIC_API_KEY"):
+    if api_key:
         cfg["claude_api_key"] = api_key
 
     # Expand paths
@@ -53,6 +77,12 @@ def load_config(config_path: str | Path | None = None) -> dict[str, Any]:
     return cfg
 
 
+def clear_config_cache() -> None:
+    """Forget memoized config lookups (e.g. after writing a new config file)."""
+    _find_config_file_in.cache_clear()
+    _load_config_cached.cache_clear()
+
+
 def load_ontology(config_path: str | Path | None = None) -> dict[str, Any]:
     """Load ontology definition."""
     candidates = [
@@ -64,17 +94,56 @@ def load_ontology(config_path: str | Path | None = None) -> dict[str, Any]:
 
     for p in candidates:
         if p.exists():
-            with open(p) as f:
-                return yaml.safe_load(f) or {}
+            return _load_yaml_cached(p) or {}
 
     # Return minimal default
     return {"entities": {"Document": {"properties": ["title", "date", "source", "summary"], "folder": "documents"}}, "relationships": []}
 
 
+def _load_yaml_cached(path: Path) -> Any:
+    """Load a YAML file, reusing a JSON sidecar cache when the YAML is unchanged.
+
+    The sidecar (``.<stem>.json`` next to the YAML) records the YAML's mtime;
+    JSON parsing is much cheaper than PyYAML, which matters for short commands.
+    """
+    cache_path = path.with_name(f".{path.stem}.json")
+    mtime_ns = path.stat().st_mtime_ns
+    try:
+        cached = json.loads(cache_path.read_text())
+        if cached.get("mtime_ns") == mtime_ns:
+            return cached["data"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path) as f:
+        data = yaml.load(f, Loader=loader)
+
+    # Only cache data that survives a JSON round-trip unchanged (no dates,
+    # non-string keys, etc.)
+    try:
+        payload = json.dumps({"mtime_ns": mtime_ns, "data": data})
+        if json.loads(payload)["data"] == data:
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=cache_path.name, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                f.write(payload)
+            os.replace(tmp, cache_path)
+    except (TypeError, ValueError, OSError):
+        pass
+
+    return data
+
+
 def _deep_merge(base: dict, override: dict) -> None:
-    """Merge override into base in-place."""
+    """Merge override into base in-place.
+
+    Config sections are only one level deep, so nested dicts are merged with a
+    single dict unpack instead of recursion. This also builds fresh section
+    dicts, so DEFAULT_CONFIG's nested sections are never mutated.
+    """
     for k, v in override.items():
-        if k in base and isinstance(base[k], dict) and isinstance(v, dict):
-            _deep_merge(base[k], v)
+        current = base.get(k)
+        if isinstance(v, dict) and isinstance(current, dict):
+            base[k] = {**current, **v}
         else:
             base[k] = v
@@ -0,0 +1,182 @@
+"""Embedding daemon: keeps the SentenceTransformer model loaded between CLI calls.
+
+Loading e5-large takes seconds, which dominates one-off commands like
+`pkv search`. `pkv daemon` (also started in the background by `pkv watch`)
+holds the model in memory and serves encode requests over a Unix socket at
+``<pkv dir>/embed.sock``. `Embedder` uses it automatically when it's running.
+
+Wire format (both directions): two big-endian uint32 lengths, a JSON header,
+then a raw payload. Responses carry float32 embeddings as raw bytes.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+SOCKET_NAME = "embed.sock"
+_FRAME = struct.Struct(">II")
+
+
+def socket_path(config: dict[str, Any]) -> Path:
+    """Daemon socket location: next to the chroma dir (~/.pkv/embed.sock by default)."""
+    return Path(config["chroma_path"]).parent / SOCKET_NAME
+
+
+def _send_msg(sock: socket.socket, header: dict[str, Any], payload: bytes = b"") -> None:
+    head = json.dumps(header).encode("utf-8")
+    sock.sendall(_FRAME.pack(len(head), len(payload)) + head + payload)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(min(n - len(buf), 1 << 20))
+        if not chunk:
+            raise ConnectionError("embedding daemon closed the connection")
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def _recv_msg(sock: socket.socket) -> tuple[dict[str, Any], bytes]:
+    head_len, payload_len = _FRAME.unpack(_recv_exact(sock, _FRAME.size))
+    header = json.loads(_recv_exact(sock, head_len))
+    payload = _recv_exact(sock, payload_len) if payload_len else b""
+    return header, payload
+
+
+class RemoteModel:
+    """Stand-in for SentenceTransformer that forwards encode() to the daemon."""
+
+    def __init__(self, path: Path, model_name: str):
+        self.path = path
+        self.model_name = model_name
+
+    def _request(self, header: dict[str, Any]) -> tuple[dict[str, Any], bytes]:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(self.path))
+            _send_msg(sock, header)
+            resp, payload = _recv_msg(sock)
+        if "error" in resp:
+            raise RuntimeError(f"Embedding daemon error: {resp['error']}")
+        return resp, payload
+
+    def ping(self) -> dict[str, Any]:
+        return self._request({"op": "ping"})[0]
+
+    def encode(self, sentences, batch_size: int = 32, normalize_embeddings: bool = False, **_kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        resp, payload = self._request({
+            "op": "encode",
+            "texts": texts,
+            "batch_size": batch_size,
+            "normalize_embeddings": normalize_embeddings,
+        })
+        arr = np.frombuffer(payload, dtype=np.float32).reshape(resp["shape"])
+        return arr[0] if single else arr
+
+
+def connect(config: dict[str, Any], model_name: str) -> RemoteModel | None:
+    """Return a RemoteModel if a daemon serving model_name is reachable, else None."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    path = socket_path(config)
+    if not path.exists():
+        return None
+    remote = RemoteModel(path, model_name)
+    try:
+        info = remote.ping()
+    except (OSError, ConnectionError, ValueError):
+        return None
+    return remote if info.get("model") == model_name else None
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server: "EmbedServer" = self.server  # type: ignore[assignment]
+        try:
+            header, _ = _recv_msg(self.request)
+            if header.get("op") == "ping":
+                _send_msg(self.request, {"model": server.model_name})
+            elif header.get("op") == "encode":
+                with server.lock:
+                    emb = server.model.encode(
+                        header["texts"],
+                        batch_size=header.get("batch_size", 32),
+                        convert_to_numpy=True,
+                        normalize_embeddings=header.get("normalize_embeddings", False),
+                        show_progress_bar=False,
+                    )
+                emb = np.ascontiguousarray(emb, dtype=np.float32)
+                _send_msg(self.request, {"shape": list(emb.shape)}, emb.tobytes())
+            else:
+                _send_msg(self.request, {"error": f"unknown op: {header.get('op')}"})
+        except ConnectionError:
+            pass
+        except Exception as e:
+            try:
+                _send_msg(self.request, {"error": str(e)})
+            except OSError:
+                pass
+
+
+class EmbedServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix-socket server holding one loaded SentenceTransformer."""
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, config: dict[str, Any]):
+        from .embeddings.embedder import load_sentence_transformer
+
+        self.model_name = config.get("embedding_model", "intfloat/e5-large-v2")
+        self.model = load_sentence_transformer(config)
+        self.lock = threading.Lock()
+        self.path = path
+        if path.exists():
+            # Stale socket from a previous run (connect() already failed)
+            path.unlink()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(str(path), _Handler)
+        os.chmod(path, 0o600)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+
+def _create_server(config: dict[str, Any]) -> EmbedServer | None:
+    model_name = config.get("embedding_model", "intfloat/e5-large-v2")
+    if connect(config, model_name) is not None:
+        return None  # already running
+    return EmbedServer(socket_path(config), config)
+
+
+def serve(config: dict[str, Any]) -> None:
+    """Run the daemon in the foreground until interrupted."""
+    server = _create_server(config)
+    if server is None:
+        raise RuntimeError(f"An embedding daemon is already running at {socket_path(config)}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def start_background(config: dict[str, Any]) -> EmbedServer | None:
+    """Start the daemon on a background thread. Returns None if one is already running."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    server = _create_server(config)
+    if server is not None:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
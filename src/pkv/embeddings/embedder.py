@@ -1,10 +1,23 @@
 """Document embedding using sentence-transformers."""
 
 import hashlib
+import os
+import queue
 import re
+import threading
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
+from ..models import ProcessedDocument
+from ..query.topk import topk_cosine
+from ..storage import get_vector_store
+
+_DATE_SEPARATED = re.compile(r'(\d{4})[/_](\d{2})[/_](\d{2})')
+# Either form in one pass: separated (YYYY/MM/DD, YYYY_MM_DD) or compact (YYYYMMDD)
+_DATE = re.compile(r'(\d{4})[/_](\d{2})[/_](\d{2})|(?P<compact>(\d{4})(\d{2})(\d{2}))')
+
 
 def _extract_date_from_title(title: str) -> str | None:
     """Extract ISO date from title like 'Meeting – 2026/02/16 11:00 GMT – Notes by Gemini'.
@@ -12,38 +25,99 @@ def _extract_date_from_title(title: str) -> str | None:
     Also handles underscored format: '2026_02_24 10_00 GMT'.
     Returns 'YYYY-MM-DD' or None.
     """
-    # Match YYYY/MM/DD or YYYY_MM_DD
-    m = re.search(r'(\d{4})[/_](\d{2})[/_](\d{2})', title)
-    if m:
+    m = _DATE.search(title)
+    if m is None:
+        return None
+    if m.group("compact") is None:
         return f"{m.group(1)}-{m.group(2)}-{m.group(3)}"
-    # Match YYYYMMDD
-    m = re.search(r'(\d{4})(\d{2})(\d{2})', title)
-    if m:
-        y, mo, d = int(m.group(1)), int(m.group(2)), int(m.group(3))
-        if 2000 <= y <= 2099 and 1 <= mo <= 12 and 1 <= d <= 31:
-            return f"{m.group(1)}-{m.group(2)}-{m.group(3)}"
+    # A separated date anywhere takes precedence over a compact one
+    sep = _DATE_SEPARATED.search(title, m.start() + 1)
+    if sep:
+        return f"{sep.group(1)}-{sep.group(2)}-{sep.group(3)}"
+    y, mo, d = int(m.group(5)), int(m.group(6)), int(m.group(7))
+    if 2000 <= y <= 2099 and 1 <= mo <= 12 and 1 <= d <= 31:
+        return f"{m.group(5)}-{m.group(6)}-{m.group(7)}"
     return None
 
-from rich.progress import Progress
 
-from ..models import ProcessedDocument
-from ..storage import get_vector_store
+def load_sentence_transformer(config: dict[str, Any]):
+    """Load the configured SentenceTransformer on the best available device.
+
+    ``embedding_device``: "auto" (default) picks CUDA, then MPS, then CPU.
+    ``embedding_precision``: "auto" (default) uses FP16 on CUDA, else FP32;
+    "fp16" / "fp32" force it.
+    ``torch_num_threads``: intra-op CPU threads (default min(cores, 8) on CPU).
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    model_name = config.get("embedding_model", "intfloat/e5-large-v2")
+    device = config.get("embedding_device", "auto")
+    if device == "auto":
+        if torch.cuda.is_available():
+            device = "cuda"
+        elif getattr(torch.backends, "mps", None) and torch.backends.mps.is_available():
+            device = "mps"
+        else:
+            device = "cpu"
+
+    # Pin CPU thread counts so many-core hosts don't oversubscribe.
+    # torch_num_threads overrides; on CPU the default is min(cores, 8).
+    num_threads = config.get("torch_num_threads")
+    if num_threads is None and device == "cpu":
+        num_threads = min(os.cpu_count() or 1, 8)
+    if num_threads:
+        torch.set_num_threads(num_threads)
+        try:
+            torch.set_num_interop_threads(max(1, num_threads // 4))
+        except RuntimeError:
+            pass  # can only be set once, before any inter-op work
+
+    model = SentenceTransformer(model_name, device=device)
+
+    precision = config.get("embedding_precision", "auto")
+    if precision == "auto":
+        precision = "fp16" if device.startswith("cuda") else "fp32"
+    if precision == "fp16":
+        try:
+            model.half()
+        except (RuntimeError, TypeError):
+            # Some layers/devices don't support half precision; stay in FP32
+            model.float()
+    return model
 
 
 class Embedder:
     """Embeds documents using sentence-transformers and stores in a vector backend."""
 
     def __init__(self, config: dict[str, Any]):
+        self.config = config
         self.model_name = config.get("embedding_model", "intfloat/e5-large-v2")
+        self.batch_size = config.get("embed_batch_size", 128)
+        # "sha256" (default) keeps IDs compatible with existing stores;
+        # "blake2b" is faster but changes every chunk ID, so only use it for new vaults
+        if config.get("chunk_id_hash", "sha256") == "blake2b":
+            self._new_chunk_hash = lambda data: hashlib.blake2b(data, digest_size=16)
+        else:
+            self._new_chunk_hash = hashlib.sha256
         self.store = get_vector_store(config)
         self._model = None
+        # IDs known to be stored, per collection, so repeated embed_documents
+        # calls in one run don't re-query the store. Holds every ID in memory;
+        # set cache_known_ids: false for very large collections.
+        self._cache_known_ids = config.get("cache_known_ids", True)
+        self._known_ids: dict[str, set[str]] = {}
+        # collection -> (ids, documents, metadatas, float32 matrix, inverse row norms)
+        self._search_cache: dict[str, tuple[list, list, list, np.ndarray, np.ndarray]] = {}
 
     @property
     def model(self):
-        """Lazy-load the embedding model."""
+        """Lazy-load the embedding model, preferring a running `pkv daemon`."""
+        if self._model is None:
+            from ..daemon import connect
+            self._model = connect(self.config, self.model_name)
         if self._model is None:
-            from sentence_transformers import SentenceTransformer
-            self._model = SentenceTransformer(self.model_name)
+            self._model = load_sentence_transformer(self.config)
         return self._model
 
     def embed_documents(self, docs: list[ProcessedDocument], collection: str = "documents") -> int:
@@ -51,81 +125,248 @@ class Embedder:
 
         Returns number of new chunks embedded.
         """
+        # Document-level short-circuit: a document's first chunk is written
+        # last and records the chunk count, so if it's stored with a matching
+        # count the whole document is already embedded
+        prefixes = []
+        probes: dict[str, ProcessedDocument] = {}
+        for doc in docs:
+            # Use source path + chunk index + content hash for uniqueness.
+            # Hash the per-document prefix once and extend a copy per chunk;
+            # the digest is identical to hashing the full key.
+            prefix_hash = self._new_chunk_hash(b"%b:%b:" % (doc.source_path.encode(), doc.content_hash.encode()))
+            prefixes.append(prefix_hash)
+            if doc.chunks:
+                probes.setdefault(self._chunk_id(prefix_hash, doc.chunks[0].index), doc)
+        complete = self._complete_documents(collection, probes)
+
+        # First pass: compute chunk IDs, skipping duplicates within this batch
+        candidates: dict[str, tuple[ProcessedDocument, Any]] = {}
+        for doc, prefix_hash in zip(docs, prefixes):
+            if id(doc) in complete:
+                continue
+            for chunk in doc.chunks:
+                candidates.setdefault(self._chunk_id(prefix_hash, chunk.index), (doc, chunk))
+
+        # Skip already embedded, with one bulk lookup instead of a query per chunk
+        existing = self._existing_ids(collection, list(candidates)) if candidates else set()
+
         ids = []
         texts = []
         metadatas = []
+        markers = []
+        for chunk_id, (doc, chunk) in candidates.items():
+            if chunk_id in existing:
+                continue
 
-        seen_ids = set()
-        for doc in docs:
-            for chunk in doc.chunks:
-                # Use source path + chunk index + content hash for uniqueness
-                chunk_id = hashlib.sha256(
-                    f"{doc.source_path}:{doc.content_hash}:{chunk.index}".encode()
-                ).hexdigest()[:32]
-
-                # Skip duplicates within this batch
-                if chunk_id in seen_ids:
-                    continue
-                seen_ids.add(chunk_id)
-
-                # Skip already embedded
-                if self.store.has_id(collection, chunk_id):
-                    continue
-
-                # e5 models need "passage: " prefix for documents
-                text = f"passage: {chunk.content}"
-                ids.append(chunk_id)
-                texts.append(text)
-                meta = {
-                    "source": doc.source_path,
-                    "title": doc.title,
-                    "chunk_index": chunk.index,
-                    "entity_type": doc.entity_type,
-                    "content_hash": doc.content_hash,
-                }
-                # Extract date from title (e.g. "Meeting – 2026/02/16 11:00 GMT – Notes by Gemini")
-                doc_date = _extract_date_from_title(doc.title)
-                if doc_date:
-                    meta["document_date"] = doc_date
-                metadatas.append(meta)
+            ids.append(chunk_id)
+            texts.append(chunk.content)
+            meta = {
+                "source": doc.source_path,
+                "title": doc.title,
+                "chunk_index": chunk.index,
+                "entity_type": doc.entity_type,
+                "content_hash": doc.content_hash,
+            }
+            is_marker = chunk is doc.chunks[0]
+            if is_marker:
+                meta["chunk_count"] = len(doc.chunks)
+            # Extract date from title (e.g. "Meeting – 2026/02/16 11:00 GMT – Notes by Gemini")
+            doc_date = _extract_date_from_title(doc.title)
+            if doc_date:
+                meta["document_date"] = doc_date
+            metadatas.append(meta)
+            markers.append(is_marker)
 
         if not ids:
             return 0
+        # A warmed search cache would miss the new chunks
+        self._search_cache.pop(collection, None)
 
-        # Embed in batches
-        batch_size = 32
+        # Smart batching: encode similar-length chunks together so each batch
+        # pads to a similar sequence length. First chunks go last (see above),
+        # so an interrupted run never leaves a document looking complete.
+        # Rows stay aligned across the lists, so no un-permuting is needed.
+        order = sorted(range(len(texts)), key=lambda i: (markers[i], -len(texts[i])))
+        ids = [ids[i] for i in order]
+        texts = [texts[i] for i in order]
+        metadatas = [metadatas[i] for i in order]
+
+        # Embed in batches. Encoding (torch releases the GIL) runs on this
+        # thread while a writer thread persists the previous batches, so
+        # store writes overlap with the next forward pass.
+        batch_size = self.batch_size
+        pool = self._start_pool(len(ids))
+        if pool is not None:
+            # Hand each iteration enough texts to give every worker a batch
+            batch_size *= len(pool["processes"])
+        # Rich's progress machinery is only needed when there's work to show
+        from rich.progress import Progress
+
+        written: queue.Queue = queue.Queue(maxsize=4)
+        errors: list[BaseException] = []
         total_embedded = 0
 
         with Progress() as progress:
             task = progress.add_task("Embedding...", total=len(ids))
-            for i in range(0, len(ids), batch_size):
-                batch_ids = ids[i:i + batch_size]
-                batch_texts = texts[i:i + batch_size]
-                batch_meta = metadatas[i:i + batch_size]
-
-                embeddings = self.model.encode(batch_texts).tolist()
-
-                # Store original text (without prefix) in ChromaDB
-                original_texts = [t.removeprefix("passage: ") for t in batch_texts]
-                self.store.add_documents(
-                    collection_name=collection,
-                    ids=batch_ids,
-                    embeddings=embeddings,
-                    documents=original_texts,
-                    metadatas=batch_meta,
-                )
-                total_embedded += len(batch_ids)
-                progress.advance(task, len(batch_ids))
 
+            def writer():
+                nonlocal total_embedded
+                while (item := written.get()) is not None:
+                    if errors:
+                        continue  # drain after a failure
+                    batch_ids, embeddings, batch_texts, batch_meta = item
+                    try:
+                        self.store.add_documents(
+                            collection_name=collection,
+                            ids=batch_ids,
+                            embeddings=embeddings,
+                            documents=batch_texts,
+                            metadatas=batch_meta,
+                        )
+                    except BaseException as e:
+                        errors.append(e)
+                        continue
+                    if collection in self._known_ids:
+                        self._known_ids[collection].update(batch_ids)
+                    total_embedded += len(batch_ids)
+                    progress.advance(task, len(batch_ids))
+
+            writer_thread = threading.Thread(target=writer, daemon=True)
+            writer_thread.start()
+            try:
+                for i in range(0, len(ids), batch_size):
+                    if errors:
+                        break
+                    batch_ids = ids[i:i + batch_size]
+                    batch_texts = texts[i:i + batch_size]
+                    batch_meta = metadatas[i:i + batch_size]
+
+                    # e5 models need "passage: " prefix for documents; only the
+                    # encoder sees it, the store gets the original text
+                    enc_texts = [f"passage: {t}" for t in batch_texts]
+
+                    embeddings = self._encode_passages(enc_texts, pool)
+                    written.put((batch_ids, embeddings, batch_texts, batch_meta))
+            finally:
+                written.put(None)
+                writer_thread.join()
+                if pool is not None:
+                    self.model.stop_multi_process_pool(pool)
+
+        if errors:
+            raise errors[0]
         return total_embedded
 
+    @staticmethod
+    def _chunk_id(prefix_hash, index: int) -> str:
+        h = prefix_hash.copy()
+        h.update(b"%d" % index)
+        return h.hexdigest()[:32]
+
+    def _complete_documents(self, collection: str, probes: dict[str, ProcessedDocument]) -> set[int]:
+        """id()s of documents whose first chunk is stored with a matching chunk_count."""
+        if not probes:
+            return set()
+        existing = self._existing_ids(collection, list(probes))
+        found = [probe for probe in probes if probe in existing]
+        if not found:
+            return set()
+        data = self.store.get_by_ids(collection, found, include=["metadatas"])
+        complete = set()
+        for probe, meta in zip(data["ids"], data.get("metadatas") or []):
+            doc = probes[probe]
+            if meta and meta.get("chunk_count") == len(doc.chunks):
+                complete.add(id(doc))
+        return complete
+
+    def _existing_ids(self, collection: str, ids: list[str]) -> set[str]:
+        """IDs already embedded; loads the collection's full ID set once per Embedder when caching."""
+        if not self._cache_known_ids:
+            return self.store.existing_ids(collection, ids)
+        known = self._known_ids.get(collection)
+        if known is None:
+            known = self._known_ids[collection] = set(self.store.get_all_ids(collection))
+        return known
+
+    def _start_pool(self, n_texts: int) -> dict | None:
+        """Start a CPU multi-process encode pool for large ingests, if configured.
+
+        Enabled by ``embed_processes`` > 1 for runs of more than
+        ``embed_multiprocess_threshold`` chunks (default 1000); below that,
+        process spawn overhead outweighs the gain.
+        """
+        n_procs = self.config.get("embed_processes", 1)
+        threshold = self.config.get("embed_multiprocess_threshold", 1000)
+        if n_procs <= 1 or n_texts <= threshold:
+            return None
+        model = self.model
+        if not hasattr(model, "start_multi_process_pool") or str(getattr(model, "device", "cpu")) != "cpu":
+            return None  # daemon-backed or on an accelerator
+        return model.start_multi_process_pool(target_devices=["cpu"] * n_procs)
+
+    def _encode_passages(self, texts: list[str], pool: dict | None = None):
+        """Encode prefixed passages to a normalized float32 array."""
+        if pool is not None:
+            embeddings = self.model.encode_multi_process(texts, pool, batch_size=self.batch_size)
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            return (embeddings / np.maximum(norms, 1e-12)).astype(np.float32, copy=False)
+        # Keep the float32 array; stores convert at their own boundary if needed
+        return self.model.encode(
+            texts,
+            batch_size=len(texts),
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+
+    def warm_cache(self, collection: str = "documents", max_vectors: int | None = None) -> bool:
+        """Load a collection's embeddings into memory for repeated searches.
+
+        Afterwards `search` scores queries with one matrix-vector product
+        instead of a store round-trip. Collections larger than
+        ``max_vectors`` (default ``search_cache_max_vectors``, 200000) are
+        left to the store. Returns True if the cache was loaded.
+        """
+        if max_vectors is None:
+            max_vectors = self.config.get("search_cache_max_vectors", 200_000)
+        if self.store.count(collection) > max_vectors:
+            return False
+
+        data = self.store.get_all(collection)
+        ids = list(data["ids"])
+        embeddings = data.get("embeddings")
+        if not ids or embeddings is None or len(embeddings) == 0:
+            return False
+
+        # Keep rows as stored (no copy for float32 or memory-mapped arrays)
+        # and precompute 1/||row|| once, so each query is one matvec plus
+        # an elementwise scale
+        matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+        inv_norms = 1.0 / np.maximum(np.linalg.norm(matrix, axis=1), 1e-12)
+        documents = data.get("documents") or [""] * len(ids)
+        metadatas = data.get("metadatas") or [{}] * len(ids)
+        self._search_cache[collection] = (ids, list(documents), list(metadatas), matrix, inv_norms)
+        return True
+
+    def clear_cache(self, collection: str | None = None) -> None:
+        """Drop in-memory search caches (all, or one collection's)."""
+        if collection is None:
+            self._search_cache.clear()
+        else:
+            self._search_cache.pop(collection, None)
+
     def search(self, query: str, collection: str = "documents", n_results: int = 10) -> list[dict]:
         """Semantic search over embedded documents."""
         # e5 models need "query: " prefix for queries
         query_text = f"query: {query}"
-        embedding = self.model.encode(query_text).tolist()
+        embedding = self.model.encode(query_text, normalize_embeddings=True)
 
-        results = self.store.query(collection, embedding, n_results=n_results)
+        cached = self._search_cache.get(collection)
+        if cached is not None:
+            return self._search_cached(cached, np.asarray(embedding, dtype=np.float32), n_results)
+
+        results = self.store.query(collection, embedding.tolist(), n_results=n_results)
 
         output = []
         if results and results["ids"] and results["ids"][0]:
@@ -137,3 +378,18 @@ class Embedder:
                     "distance": results["distances"][0][i] if results["distances"] else 0,
                 })
         return output
+
+    @staticmethod
+    def _search_cached(cached: tuple, query_vec: np.ndarray, n_results: int) -> list[dict]:
+        """Top-n by dot product over a warmed cache; distance is cosine distance like Chroma's."""
+        ids, documents, metadatas, matrix, inv_norms = cached
+        top, scores = topk_cosine(matrix, query_vec, n_results, inv_norms=inv_norms)
+        return [
+            {
+                "id": ids[i],
+                "document": documents[i],
+                "metadata": metadatas[i],
+                "distance": float(1.0 - score),
+            }
+            for i, score in zip(top, scores)
+        ]
@@ -1,6 +1,9 @@
 """Claude API enrichment for clusters and documents."""
 
 import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 
 from ..storage import get_vector_store
@@ -9,7 +12,9 @@ from ..vault.ontology import OntologyManager
 from ..vault.templates import render_entity_page
 from .prompts import CLUSTER_ANALYSIS_PROMPT
 
-from pathlib import Path
+_JSON_FENCE = re.compile(r"```(?:json)?\s*\n?(.*?)\n?\s*```", re.DOTALL)
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+_UNSAFE_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]')
 
 
 class Enricher:
@@ -36,54 +41,87 @@ class Enricher:
         max_clusters = enrichment_cfg.get("max_clusters", 20)
         max_docs = enrichment_cfg.get("max_docs_per_cluster", 10)
 
-        results = []
-        for cluster in clusters[:max_clusters]:
-            # Fetch documents for cluster
-            collection = self.store.get_or_create_collection("documents")
-            doc_ids = cluster.document_ids[:max_docs]
-            data = collection.get(ids=doc_ids, include=["documents", "metadatas"])
+        # Fetch every cluster's documents in one batched lookup, then demux
+        selected = clusters[:max_clusters]
+        all_ids = list(dict.fromkeys(
+            doc_id for cluster in selected for doc_id in cluster.document_ids[:max_docs]
+        ))
+        by_id: dict[str, tuple[str, dict]] = {}
+        if all_ids:
+            data = self.store.get_by_ids("documents", all_ids, include=["documents", "metadatas"])
+            documents = data.get("documents") or []
+            metadatas = data.get("metadatas") or [None] * len(documents)
+            by_id = {
+                doc_id: (doc, meta or {})
+                for doc_id, doc, meta in zip(data["ids"], documents, metadatas)
+            }
+
+        # Claude calls are network-bound, so run them concurrently
+        concurrency = max(1, enrichment_cfg.get("concurrency", 6))
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [pool.submit(self._enrich_one, cluster, by_id, max_docs) for cluster in selected]
+            outcomes = [f.result() for f in futures]
 
-            if data["documents"] is None or len(data["documents"]) == 0:
+        results = []
+        for result in outcomes:
+            if result is None:
+                continue
+            results.append(result)
+            # Create entity pages on this thread, in cluster order, so
+            # concurrent results never race on the same page
+            if "error" in result:
                 continue
-
-            # Format documents for prompt
-            doc_texts = []
-            for i, doc in enumerate(data["documents"]):
-                meta = data["metadatas"][i] if data["metadatas"] else {}
-                title = meta.get("title", f"Document {i+1}")
-                doc_texts.append(f"### {title}\n{doc[:1000]}")  # Truncate long docs
-
-            prompt = CLUSTER_ANALYSIS_PROMPT.format(
-                documents="\n\n---\n\n".join(doc_texts)
-            )
-
             try:
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=1000,
-                    messages=[{"role": "user", "content": prompt}],
-                )
-                text = response.content[0].text
-                result = self._parse_json_response(text)
-                result["cluster_id"] = cluster.cluster_id
-                result["document_ids"] = cluster.document_ids
-                results.append(result)
-
-                # Create entity pages for discovered entities
                 self._create_entity_pages(result.get("entities", []))
-
             except Exception as e:
                 results.append({
-                    "cluster_id": cluster.cluster_id,
+                    "cluster_id": result["cluster_id"],
                     "error": str(e),
                 })
 
         return results
 
+    def _enrich_one(
+        self,
+        cluster: ClusterResult,
+        by_id: dict[str, tuple[str, dict]],
+        max_docs: int,
+    ) -> dict[str, Any] | None:
+        """Analyse one cluster with Claude. Returns None if none of its documents were found."""
+        found = [by_id[doc_id] for doc_id in cluster.document_ids[:max_docs] if doc_id in by_id]
+        if not found:
+            return None
+
+        # Format documents for prompt
+        doc_texts = []
+        for i, (doc, meta) in enumerate(found):
+            title = meta.get("title", f"Document {i+1}")
+            doc_texts.append(f"### {title}\n{doc[:1000]}")  # Truncate long docs
+
+        prompt = CLUSTER_ANALYSIS_PROMPT.format(
+            documents="\n\n---\n\n".join(doc_texts)
+        )
+
+        try:
+            response = self.client.messages.create(
+                model=self.model,
+                max_tokens=1000,
+                messages=[{"role": "user", "content": prompt}],
+            )
+            text = response.content[0].text
+            result = self._parse_json_response(text)
+            result["cluster_id"] = cluster.cluster_id
+            result["document_ids"] = cluster.document_ids
+            return result
+        except Exception as e:
+            return {
+                "cluster_id": cluster.cluster_id,
+                "error": str(e),
+            }
+
     @staticmethod
     def _parse_json_response(text: str) -> dict:
         """Extract JSON from Claude's response, handling markdown code blocks."""
-        import re
         # Try direct parse first
         text = text.strip()
         try:
@@ -92,7 +130,7 @@ class Enricher:
             pass
 
         # Try extracting from ```json ... ``` or ``` ... ```
-        match = re.search(r"```(?:json)?\s*\n?(.*?)\n?\s*```", text, re.DOTALL)
+        match = _JSON_FENCE.search(text)
         if match:
             try:
                 return json.loads(match.group(1).strip())
@@ -100,7 +138,7 @@ class Enricher:
                 pass
 
         # Try finding first { ... } block
-        match = re.search(r"\{.*\}", text, re.DOTALL)
+        match = _JSON_OBJECT.search(text)
         if match:
             try:
                 return json.loads(match.group(0))
@@ -130,9 +168,8 @@ class Enricher:
             target_dir.mkdir(parents=True, exist_ok=True)
 
             # Sanitize name for filesystem (remove / \ : * ? " < > |)
-            import re
-            safe_name = re.sub(r'[<>:"/\\|?*]', ' - ', name)
-            safe_name = re.sub(r'\s+', ' ', safe_name).strip(". ")
+            safe_name = _UNSAFE_FILENAME_CHARS.sub(" - ", name)
+            safe_name = " ".join(safe_name.split()).strip(". ")
             if not safe_name:
                 continue
 
@@ -0,0 +1,15 @@
+"""Streaming file digests shared by ingest and sync."""
+
+import hashlib
+from pathlib import Path
+
+
+def file_digest(path: str | Path, algo: str = "sha256") -> str:
+    """Hex digest of a file's bytes, streamed rather than read into memory."""
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, algo).hexdigest()
+        h = hashlib.new(algo)
+        while block := f.read(1 << 20):
+            h.update(block)
+        return h.hexdigest()
@@ -2,6 +2,9 @@
 
 import re
 
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
 
 def estimate_tokens(text: str) -> int:
     """Rough token estimate (~4 chars per token)."""
@@ -33,46 +36,63 @@ def chunk_text(
 
     if respect_boundaries:
         # Split into paragraphs first
-        blocks = re.split(r"\n\s*\n", text)
+        blocks = _PARAGRAPH_SPLIT.split(text)
     else:
         blocks = [text]
 
     chunks: list[str] = []
-    current = ""
+    prev_tail = ""
+
+    def emit(text: str) -> None:
+        # Overlap is fused in: prefix each chunk with the tail of the previous
+        # (un-overlapped) chunk as it's emitted
+        nonlocal prev_tail
+        base = text.strip()
+        chunks.append(f"{prev_tail}\n\n{base}" if chunks and overlap_chars > 0 else base)
+        if overlap_chars > 0:
+            prev_tail = base[-overlap_chars:]
+
+    # The chunk being built, as pieces (separators included) plus its length,
+    # to avoid quadratic string concatenation on long documents
+    parts: list[str] = []
+    length = 0
+
+    def append(piece: str, sep: str) -> None:
+        nonlocal length
+        if parts:
+            parts.append(sep)
+            length += len(sep)
+        parts.append(piece)
+        length += len(piece)
+
+    def flush() -> None:
+        nonlocal length
+        if parts:
+            emit("".join(parts))
+        parts.clear()
+        length = 0
 
     for block in blocks:
         block = block.strip()
         if not block:
             continue
 
-        if len(current) + len(block) + 2 <= max_chars:
-            current = f"{current}\n\n{block}" if current else block
+        if length + len(block) + 2 <= max_chars:
+            append(block, "\n\n")
         else:
-            if current:
-                chunks.append(current.strip())
+            flush()
             # If single block exceeds max, force-split by sentences
             if len(block) > max_chars:
-                sentences = re.split(r"(?<=[.!?])\s+", block)
-                current = ""
-                for sent in sentences:
-                    if len(current) + len(sent) + 1 <= max_chars:
-                        current = f"{current} {sent}" if current else sent
+                for sent in _SENTENCE_SPLIT.split(block):
+                    if length + len(sent) + 1 <= max_chars:
+                        append(sent, " ")
                     else:
-                        if current:
-                            chunks.append(current.strip())
-                        current = sent
+                        flush()
+                        append(sent, " ")
             else:
-                current = block
-
-    if current.strip():
-        chunks.append(current.strip())
-
-    # Add overlap
-    if overlap_chars > 0 and len(chunks) > 1:
-        overlapped = [chunks[0]]
-        for i in range(1, len(chunks)):
-            prev_tail = chunks[i - 1][-overlap_chars:]
-            overlapped.append(prev_tail + "\n\n" + chunks[i])
-        return overlapped
+                append(block, "\n\n")
+
+    if "".join(parts).strip():
+        flush()
 
     return chunks
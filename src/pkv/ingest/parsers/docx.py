@@ -11,12 +11,14 @@ class DocxParser:
         from docx import Document
 
         doc = Document(str(file_path))
-        paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
-        content = "\n\n".join(paragraphs)
+        # Paragraph.text is rebuilt from the XML runs on every access, so read
+        # it once per paragraph and join in a single pass
+        content = "\n\n".join(
+            t for t in (p.text for p in doc.paragraphs) if t and not t.isspace()
+        )
 
-        title = file_path.stem
-        if doc.core_properties.title:
-            title = doc.core_properties.title
+        core_title = doc.core_properties.title
+        title = core_title if core_title else file_path.stem
 
         return {
             "content": content,
@@ -5,23 +5,32 @@ from typing import Any
 
 
 class HtmlParser:
-    """Parse HTML files using BeautifulSoup."""
+    """Parse HTML files using lxml."""
 
     def parse(self, file_path: Path) -> dict[str, Any]:
-        from bs4 import BeautifulSoup
+        from lxml import etree, html
 
         text = file_path.read_text(encoding="utf-8", errors="replace")
-        soup = BeautifulSoup(text, "lxml")
-
-        # Remove scripts and styles
-        for tag in soup(["script", "style", "nav", "footer", "header"]):
-            tag.decompose()
-
         title = file_path.stem
-        if soup.title and soup.title.string:
-            title = soup.title.string.strip()
-
-        content = soup.get_text(separator="\n", strip=True)
+        try:
+            # Parse bytes so documents with an XML encoding declaration are accepted
+            tree = html.document_fromstring(
+                text.encode("utf-8"), parser=html.HTMLParser(encoding="utf-8")
+            )
+        except etree.ParserError:
+            # Empty or whitespace-only document
+            return {"content": "", "metadata": {"source_type": "html"}, "title": title}
+
+        # Remove scripts, styles and page chrome; drop_tree keeps the text that follows
+        for tag in tree.xpath("//script|//style|//nav|//footer|//header"):
+            tag.drop_tree()
+        etree.strip_elements(tree, etree.Comment, etree.ProcessingInstruction, with_tail=False)
+
+        title_el = tree.find(".//title")
+        if title_el is not None and title_el.text and title_el.text.strip():
+            title = title_el.text.strip()
+
+        content = "\n".join(s for s in (t.strip() for t in tree.itertext()) if s)
 
         return {
             "content": content,
@@ -1,6 +1,7 @@
 """JSON parser with special handling for ChatGPT/Claude export formats."""
 
 import json
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
@@ -43,11 +44,11 @@ class JsonParser:
                 if msg and msg.get("content", {}).get("parts"):
                     role = msg.get("author", {}).get("role", "unknown")
                     content_parts = msg["content"]["parts"]
-                    text = "\n".join(str(p) for p in content_parts if isinstance(p, str))
+                    text = "\n".join(p for p in content_parts if isinstance(p, str))
                     if text.strip():
                         create_time = msg.get("create_time") or 0
                         messages.append((create_time, role, text))
-            messages.sort(key=lambda x: x[0])
+            messages.sort(key=itemgetter(0))
             for _, role, text in messages:
                 parts.append(f"**{role}**: {text}\n")
 
@@ -55,7 +56,7 @@ class JsonParser:
         return {
             "content": content,
             "metadata": {"source_type": "conversation", "platform": "chatgpt"},
-            "title": title if title != file_path_stem else conversations[0].get("title", title),
+            "title": conversations[0].get("title", title),
         }
 
     def _parse_claude(self, conversations: list, title: str) -> dict[str, Any]:
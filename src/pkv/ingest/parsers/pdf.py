@@ -1,9 +1,39 @@
 """PDF file parser."""
 
+import multiprocessing
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any
 
+# Lines that are structure (kept on their own line) rather than flowing text
+_TIMESTAMP = re.compile(r"^\d{2}:\d{2}(:\d{2})?$")
+_SPEAKER = re.compile(r"^[A-Z][a-z]+ [A-Z][a-z]+:$")  # "First Last:"
+_HEADER = re.compile(r"^#{1,6}\s")
+_LIST_ITEM = re.compile(r"^[-*•]\s")
+
+# Below this many pages, worker start-up costs more than it saves
+_PARALLEL_MIN_PAGES = 16
+
+
+def _read_pages(reader, start: int, stop: int) -> list[str]:
+    """Extract and clean pages [start, stop) from an open PdfReader."""
+    pages = []
+    for i in range(start, stop):
+        text = reader.pages[i].extract_text()
+        if text:
+            pages.append(PdfParser._clean_page(text))
+    return pages
+
+
+def _extract_pages(args: tuple[str, int, int]) -> list[str]:
+    """Worker entry point: open the PDF and extract pages [start, stop)."""
+    from pypdf import PdfReader
+
+    path, start, stop = args
+    return _read_pages(PdfReader(path), start, stop)
+
 
 class PdfParser:
     """Parse PDF files using pypdf."""
@@ -12,11 +42,10 @@ class PdfParser:
         from pypdf import PdfReader
 
         reader = PdfReader(str(file_path))
-        pages = []
-        for page in reader.pages:
-            text = page.extract_text()
-            if text:
-                pages.append(self._clean_page(text))
+        n_pages = len(reader.pages)
+        pages = self._extract_parallel(file_path, n_pages) if n_pages >= _PARALLEL_MIN_PAGES else None
+        if pages is None:
+            pages = _read_pages(reader, 0, n_pages)
 
         content = "\n\n".join(pages)
         title = file_path.stem
@@ -31,10 +60,30 @@ class PdfParser:
 
         return {
             "content": content,
-            "metadata": {"source_type": "pdf", "page_count": len(reader.pages)},
+            "metadata": {"source_type": "pdf", "page_count": n_pages},
             "title": title,
         }
 
+    @staticmethod
+    def _extract_parallel(file_path: Path, n_pages: int) -> list[str] | None:
+        """Extract text across processes (pypdf is pure Python and holds the GIL).
+
+        Each worker opens its own reader and handles a contiguous page range.
+        Returns None when there's only one core, or when already running in a
+        worker process, so the caller runs sequentially.
+        """
+        if multiprocessing.parent_process() is not None:
+            return None  # already in an ingest worker; don't nest pools
+        workers = min(os.cpu_count() or 1, n_pages // (_PARALLEL_MIN_PAGES // 2))
+        if workers <= 1:
+            return None
+        step = -(-n_pages // workers)
+        ranges = [(str(file_path), i, min(i + step, n_pages)) for i in range(0, n_pages, step)]
+        # spawn, not fork: the caller may hold torch/watcher threads
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=len(ranges), mp_context=ctx) as pool:
+            return [page for chunk in pool.map(_extract_pages, ranges) for page in chunk]
+
     @staticmethod
     def _clean_page(text: str) -> str:
         """Rejoin words that pypdf splits across lines.
@@ -59,10 +108,10 @@ class PdfParser:
 
             # Check if this line is a structural element (keep on its own line)
             is_structural = bool(
-                re.match(r"^\d{2}:\d{2}(:\d{2})?$", stripped)  # timestamp
-                or re.match(r"^[A-Z][a-z]+ [A-Z][a-z]+:$", stripped)  # "First Last:"
-                or re.match(r"^#{1,6}\s", stripped)  # markdown header
-                or re.match(r"^[-*•]\s", stripped)  # list item
+                _TIMESTAMP.match(stripped)
+                or _SPEAKER.match(stripped)
+                or _HEADER.match(stripped)
+                or _LIST_ITEM.match(stripped)
             )
 
             if is_structural:
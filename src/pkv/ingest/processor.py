@@ -1,17 +1,37 @@
 """Universal document processor - the heart of ingestion."""
 
 import hashlib
+import multiprocessing
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from typing import Any
 
+from ..hashing import file_digest
 from ..models import Chunk, ProcessedDocument
 from .chunker import chunk_text
 from .parsers import PARSERS
 
+# Below this many files, worker start-up costs more than parallel parsing saves
+_PARALLEL_MIN_FILES = 32
 
-def compute_hash(content: str) -> str:
-    """SHA256 hash of content for dedup."""
-    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+# One instance per parser class per process (workers reuse them across files)
+_PARSER_CACHE: dict[type, Any] = {}
+
+
+def compute_hash(content: str | bytes | Path) -> str:
+    """SHA256 hash of content for dedup.
+
+    Text is hashed as UTF-8. A Path hashes the file's raw bytes, streamed
+    rather than read into memory.
+    """
+    if isinstance(content, Path):
+        return file_digest(content)
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
 
 
 def process_file(file_path: Path, config: dict[str, Any]) -> ProcessedDocument | None:
@@ -29,7 +49,9 @@ def process_file(file_path: Path, config: dict[str, Any]) -> ProcessedDocument |
     if parser_cls is None:
         return None
 
-    parser = parser_cls()
+    parser = _PARSER_CACHE.get(parser_cls)
+    if parser is None:
+        parser = _PARSER_CACHE[parser_cls] = parser_cls()
     result = parser.parse(file_path)
 
     content = result["content"]
@@ -52,10 +74,10 @@ def process_file(file_path: Path, config: dict[str, Any]) -> ProcessedDocument |
         respect_boundaries=chunk_cfg.get("respect_boundaries", True),
     )
 
-    chunks = [
-        Chunk(content=c, index=i, metadata={"source": str(file_path), "title": title})
-        for i, c in enumerate(text_chunks)
-    ]
+    # Every chunk of a document carries the same source/title, so share one
+    # (read-only) dict instead of allocating one per chunk
+    chunk_meta = {"source": str(file_path), "title": title}
+    chunks = [Chunk(content=c, index=i, metadata=chunk_meta) for i, c in enumerate(text_chunks)]
 
     return ProcessedDocument(
         title=title,
@@ -70,36 +92,79 @@ def process_file(file_path: Path, config: dict[str, Any]) -> ProcessedDocument |
     )
 
 
+def _scandir_recursive(path: str | os.PathLike) -> Iterator[os.DirEntry]:
+    """Yield DirEntry objects for all regular files under path.
+
+    Uses os.scandir so file-type checks come from cached directory entries
+    instead of extra stat() calls. Symlinks are skipped.
+    """
+    stack = [os.fspath(path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_symlink():
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+        except OSError:
+            continue
+
+
 def process_directory(ingest_path: Path, config: dict[str, Any]) -> list[ProcessedDocument]:
-    """Process all files in a directory."""
-    docs = []
+    """Process all files in a directory.
+
+    Files are parsed across ``ingest_workers`` processes (default: one per
+    core, up to 8) when there are enough of them; results keep path order.
+    """
     if not ingest_path.exists():
-        return docs
+        return []
+
+    entries = sorted(_scandir_recursive(ingest_path), key=lambda e: e.path)
+    paths = [
+        Path(entry.path) for entry in entries
+        if not entry.name.startswith(".") and os.path.splitext(entry.name)[1].lower() in PARSERS
+    ]
+
+    workers = config.get("ingest_workers") or min(os.cpu_count() or 1, 8)
+    workers = min(workers, len(paths))
+    if workers > 1 and len(paths) >= _PARALLEL_MIN_FILES:
+        # spawn, not fork: callers (watcher, embedder) may hold threads
+        ctx = multiprocessing.get_context("spawn")
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            results = list(pool.map(process_file, paths, repeat(config), chunksize=chunksize))
+    else:
+        results = [process_file(p, config) for p in paths]
+
+    return [doc for doc in results if doc]
+
+
+# Source types that determine the entity type outright
+_SOURCE_TYPE_ENTITIES = {"conversation": "Conversation"}
 
-    for file_path in sorted(ingest_path.rglob("*")):
-        if file_path.is_file() and not file_path.name.startswith("."):
-            doc = process_file(file_path, config)
-            if doc:
-                docs.append(doc)
-    return docs
+_MEETING_KEYWORDS = (
+    "meeting", "standup", "stand-up", "sync", "check-in",
+    "check in", "debrief", "handover", "hand-over", "retro",
+    "sprint", "planning", "review", "retrospective",
+    "notes by gemini", "transcript", "attendees", "participants",
+    "action items", "minutes",
+)
 
 
 def _infer_entity_type(source_type: str, metadata: dict) -> str:
     """Infer the ontology entity type from source metadata."""
-    if source_type == "conversation":
-        return "Conversation"
+    entity_type = _SOURCE_TYPE_ENTITIES.get(source_type)
+    if entity_type:
+        return entity_type
 
     # Check title and content for meeting indicators
-    title = (metadata.get("title", "") or "").lower()
-    content_preview = (metadata.get("content_preview", "") or "").lower()
-    text = f"{title} {content_preview}"
-
-    meeting_keywords = ["meeting", "standup", "stand-up", "sync", "check-in",
-                        "check in", "debrief", "handover", "hand-over", "retro",
-                        "sprint", "planning", "review", "retrospective",
-                        "notes by gemini", "transcript", "attendees", "participants",
-                        "action items", "minutes"]
-    if any(kw in text for kw in meeting_keywords):
+    title = metadata.get("title", "") or ""
+    content_preview = metadata.get("content_preview", "") or ""
+    text = f"{title} {content_preview}".lower()
+    if any(kw in text for kw in _MEETING_KEYWORDS):
         return "Meeting"
 
     return "Document"
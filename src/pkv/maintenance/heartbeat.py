@@ -1,9 +1,12 @@
 """Heartbeat: summarize recent activity and load relevant context."""
 
+import os
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from ..vault.index import iter_markdown_files
+
 
 def get_recent_documents(config: dict[str, Any], days: int = 7) -> list[dict[str, Any]]:
     """Get documents modified in the last N days."""
@@ -14,15 +17,14 @@ def get_recent_documents(config: dict[str, Any], days: int = 7) -> list[dict[str
     cutoff = datetime.now() - timedelta(days=days)
     recent = []
 
-    for md_file in vault_path.rglob("*.md"):
-        if md_file.name.startswith("."):
-            continue
-        mtime = datetime.fromtimestamp(md_file.stat().st_mtime)
-        if mtime >= cutoff:
+    cutoff_ts = cutoff.timestamp()
+    for entry in iter_markdown_files(vault_path):
+        mtime = entry.stat().st_mtime
+        if mtime >= cutoff_ts:
             recent.append({
-                "path": str(md_file),
-                "name": md_file.stem,
-                "modified": mtime.isoformat(),
+                "path": entry.path,
+                "name": entry.name[:-3],
+                "modified": datetime.fromtimestamp(mtime).isoformat(),
             })
 
     recent.sort(key=lambda x: x["modified"], reverse=True)
@@ -36,12 +38,12 @@ def vault_stats(config: dict[str, Any]) -> dict[str, Any]:
         return {"total_documents": 0, "folders": {}}
 
     stats: dict[str, Any] = {"total_documents": 0, "folders": {}}
-    for md_file in vault_path.rglob("*.md"):
-        if md_file.name.startswith("."):
-            continue
+    root = str(vault_path)
+    for entry in iter_markdown_files(root):
         stats["total_documents"] += 1
-        folder = md_file.parent.relative_to(vault_path).parts
-        folder_name = folder[0] if folder else "root"
+        # Top-level folder from the path relative to the vault
+        rel = os.path.relpath(entry.path, root).split(os.sep)
+        folder_name = rel[0] if len(rel) > 1 else "root"
         stats["folders"][folder_name] = stats["folders"].get(folder_name, 0) + 1
 
     # ChromaDB stats
@@ -6,6 +6,16 @@ from typing import Any
 
 import yaml
 
+from ..vault.index import iter_markdown_files
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# {path: [mtime_ns, size, content_hash or null]} from the last run, so
+# unchanged notes aren't re-read and re-parsed. Size is part of the key so an
+# edit that keeps the mtime (coarse clocks, tools preserving times) still
+# invalidates the entry.
+FRONTMATTER_CACHE_FILE = ".pkv_frontmatter_cache.json"
+
 
 def run_janitor(config: dict[str, Any]) -> dict[str, int]:
     """Run maintenance tasks on the vault.
@@ -18,40 +28,89 @@ def run_janitor(config: dict[str, Any]) -> dict[str, int]:
     if not vault_path.exists():
         return stats
 
-    # Check for duplicate content hashes
+    cache_path = vault_path / FRONTMATTER_CACHE_FILE
+    cache = _load_cache(cache_path)
+    new_cache: dict[str, list] = {}
+
+    # Single pass: collect content hashes and fix missing frontmatter
     hashes: dict[str, list[Path]] = {}
-    for md_file in vault_path.rglob("*.md"):
-        if md_file.name.startswith("."):
-            continue
-        text = md_file.read_text(encoding="utf-8", errors="replace")
-        # Extract content_hash from frontmatter
-        if text.startswith("---"):
-            try:
-                fm_end = text.index("---", 3)
-                fm = yaml.safe_load(text[3:fm_end])
-                if fm and "content_hash" in fm:
-                    h = fm["content_hash"]
-                    hashes.setdefault(h, []).append(md_file)
-            except (ValueError, yaml.YAMLError):
-                pass
+    for entry in iter_markdown_files(vault_path):
+        md_file = Path(entry.path)
+        st = entry.stat()
+        key = [st.st_mtime_ns, st.st_size]
+        cached = cache.get(entry.path)
+        if isinstance(cached, list) and len(cached) == 3 and cached[:2] == key:
+            h = cached[2]
+        else:
+            h = None
+            fm_text = _read_frontmatter(md_file)
+            if fm_text is None:
+                # Add minimal frontmatter
+                text = md_file.read_text(encoding="utf-8", errors="replace")
+                fm = {"title": md_file.stem, "type": "Document"}
+                new_text = f"---\n{yaml.dump(fm, default_flow_style=False)}---\n{text}"
+                md_file.write_text(new_text, encoding="utf-8")
+                stats["frontmatter_fixed"] += 1
+                st = md_file.stat()
+                key = [st.st_mtime_ns, st.st_size]
+            elif fm_text:
+                # Extract content_hash from frontmatter
+                try:
+                    fm = yaml.load(fm_text, Loader=_YAML_LOADER)
+                    if isinstance(fm, dict) and "content_hash" in fm:
+                        h = fm["content_hash"]
+                except yaml.YAMLError:
+                    pass
+        new_cache[entry.path] = [*key, h]
+        if h is not None:
+            hashes.setdefault(h, []).append(md_file)
 
     # Remove duplicates (keep first)
     for h, files in hashes.items():
         if len(files) > 1:
             for dup in files[1:]:
                 dup.unlink()
+                new_cache.pop(str(dup), None)
                 stats["duplicates_removed"] += 1
 
-    # Validate frontmatter
-    for md_file in vault_path.rglob("*.md"):
-        if md_file.name.startswith("."):
-            continue
-        text = md_file.read_text(encoding="utf-8", errors="replace")
-        if not text.startswith("---"):
-            # Add minimal frontmatter
-            fm = {"title": md_file.stem, "type": "Document"}
-            new_text = f"---\n{yaml.dump(fm, default_flow_style=False)}---\n{text}"
-            md_file.write_text(new_text, encoding="utf-8")
-            stats["frontmatter_fixed"] += 1
-
+    _save_cache(cache_path, new_cache)
     return stats
+
+
+def _read_frontmatter(path: Path, block_size: int = 4096) -> str | None:
+    """Return the text between the opening and closing '---', reading only that far.
+
+    Returns None if the file doesn't start with '---', and "" if the
+    frontmatter is never closed. Notes are usually much longer than their
+    frontmatter, so this avoids reading whole files.
+    """
+    with open(path, encoding="utf-8", errors="replace") as f:
+        buf = f.read(block_size)
+        if not buf.startswith("---"):
+            return None
+        start = 3
+        while True:
+            end = buf.find("---", start)
+            if end != -1:
+                return buf[3:end]
+            more = f.read(block_size)
+            if not more:
+                return ""
+            # Re-scan the last two chars in case '---' straddles the boundary
+            start = max(3, len(buf) - 2)
+            buf += more
+
+
+def _load_cache(path: Path) -> dict[str, list]:
+    try:
+        cache = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_cache(path: Path, cache: dict[str, list]) -> None:
+    try:
+        path.write_text(json.dumps(cache))
+    except OSError:
+        pass
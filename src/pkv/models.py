@@ -5,9 +5,13 @@ from datetime import datetime
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class Chunk:
-    """A chunk of text from a document."""
+    """A chunk of text from a document.
+
+    Slotted: documents can have hundreds of chunks, and a per-instance
+    __dict__ is most of a small object's footprint.
+    """
     content: str
     index: int
     metadata: dict[str, Any] = field(default_factory=dict)
@@ -34,8 +38,11 @@ class ClusterResult:
     """Result of clustering."""
     cluster_id: int
     document_ids: list[str]
-    centroid: list[float] | None = None
+    centroid: Any = None  # np.ndarray (float16) or list[float]; .tolist() only when persisting
     label: str = ""
+    # Member embeddings (float32, rows aligned with document_ids) kept from
+    # the clustering pass so downstream steps don't re-read the store.
+    embeddings: Any = field(default=None, repr=False, compare=False)
 
 
 @dataclass
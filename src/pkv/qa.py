@@ -1,17 +1,56 @@
 """RAG-based Q&A over the knowledge vault."""
 
-from typing import Any
+from functools import lru_cache
+from typing import Any, Iterator
 
 import anthropic
 
 from .query.search import semantic_search
 
+NO_RESULTS_ANSWER = "No relevant documents found. Have you run 'pkv embed'?"
+
+
+@lru_cache(maxsize=4)
+def _get_client(api_key: str) -> anthropic.Anthropic:
+    """One client per key, so repeated questions reuse its connection pool."""
+    return anthropic.Anthropic(api_key=api_key, max_retries=3)
+
 
 def ask_question(question: str, config: dict[str, Any], n_chunks: int = 10, since: str | None = None) -> dict:
     """Answer a question using RAG over the vault.
 
     Returns dict with 'answer' and 'sources' (list of document titles).
     """
+    request, sources = _prepare(question, config, n_chunks, since)
+    if request is None:
+        return {"answer": NO_RESULTS_ANSWER, "sources": []}
+
+    response = _get_client(config["claude_api_key"]).messages.create(**request)
+    return {
+        "answer": response.content[0].text,
+        "sources": sources,
+    }
+
+
+def ask_question_stream(
+    question: str, config: dict[str, Any], n_chunks: int = 10, since: str | None = None
+) -> tuple[Iterator[str], list[str]]:
+    """Like ask_question, but returns (text chunks as they arrive, sources)."""
+    request, sources = _prepare(question, config, n_chunks, since)
+    if request is None:
+        return iter([NO_RESULTS_ANSWER]), []
+
+    def chunks() -> Iterator[str]:
+        with _get_client(config["claude_api_key"]).messages.stream(**request) as stream:
+            yield from stream.text_stream
+
+    return chunks(), sources
+
+
+def _prepare(
+    question: str, config: dict[str, Any], n_chunks: int, since: str | None
+) -> tuple[dict[str, Any] | None, list[str]]:
+    """Retrieve context and build the messages request (None if nothing matched)."""
     api_key = config.get("claude_api_key")
     if not api_key:
         raise ValueError(
@@ -82,7 +121,7 @@ def ask_question(question: str, config: dict[str, Any], n_chunks: int = 10, sinc
         results = semantic_search(question, config, n_results=n_chunks)
 
     if not results:
-        return {"answer": "No relevant documents found. Have you run 'pkv embed'?", "sources": []}
+        return None, []
 
     # Build context from search results
     context_parts = []
@@ -94,13 +133,12 @@ def ask_question(question: str, config: dict[str, Any], n_chunks: int = 10, sinc
 
     context = "\n\n---\n\n".join(context_parts)
 
-    client = anthropic.Anthropic(api_key=api_key)
     model = config.get("claude_model", "claude-opus-4-0725")
 
     from datetime import datetime
     today = datetime.now().strftime("%A, %Y-%m-%d")
 
-    response = client.messages.create(
+    request = dict(
         model=model,
         max_tokens=2000,
         system=f"You are a helpful assistant answering questions based on the user's personal knowledge base. "
@@ -114,8 +152,4 @@ def ask_question(question: str, config: dict[str, Any], n_chunks: int = 10, sinc
             "content": f"Context from my knowledge vault:\n\n{context}\n\n---\n\nQuestion: {question}",
         }],
     )
-
-    return {
-        "answer": response.content[0].text,
-        "sources": list(sources.keys()),
-    }
+    return request, list(sources.keys())
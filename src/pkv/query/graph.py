@@ -1,26 +1,41 @@
 """Relationship graph traversal."""
 
 import re
-from pathlib import Path
 from typing import Any
 
+from ..vault.index import iter_markdown_files
+
+_WIKILINK = re.compile(r"\[\[([^\]|]+)(?:\|[^\]]+)?\]\]")
+
+
+# vault path -> {note path: (mtime_ns, links)}, so repeated graph builds in
+# one process only re-read notes that changed
+_LINK_CACHE: dict[str, dict[str, tuple[int, list[str]]]] = {}
+
 
 def find_wikilinks(vault_path: str) -> dict[str, list[str]]:
     """Build a graph of wikilink connections in the vault.
 
     Returns dict mapping document name -> list of linked document names.
     """
-    vault = Path(vault_path)
+    key = str(vault_path)
+    previous = _LINK_CACHE.get(key, {})
+    current: dict[str, tuple[int, list[str]]] = {}
     graph: dict[str, list[str]] = {}
 
-    for md_file in vault.rglob("*.md"):
-        if md_file.name.startswith("."):
-            continue
-        name = md_file.stem
-        text = md_file.read_text(encoding="utf-8", errors="replace")
-        links = re.findall(r"\[\[([^\]|]+)(?:\|[^\]]+)?\]\]", text)
-        graph[name] = links
+    for entry in iter_markdown_files(vault_path):
+        mtime_ns = entry.stat().st_mtime_ns
+        cached = previous.get(entry.path)
+        if cached and cached[0] == mtime_ns:
+            links = cached[1]
+        else:
+            with open(entry.path, encoding="utf-8", errors="replace") as f:
+                text = f.read()
+            links = _WIKILINK.findall(text)
+        current[entry.path] = (mtime_ns, links)
+        graph[entry.name[:-3]] = list(links)
 
+    _LINK_CACHE[key] = current
     return graph
 
 
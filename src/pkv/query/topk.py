@@ -0,0 +1,30 @@
+"""Brute-force top-k cosine search over an in-memory embedding matrix."""
+
+import numpy as np
+
+
+def topk_cosine(
+    matrix: np.ndarray,
+    query: np.ndarray,
+    k: int,
+    inv_norms: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return (indices, scores) of the k rows most similar to query, best first.
+
+    ``query`` must be L2-normalized. Rows are either normalized already, or
+    ``inv_norms`` holds each row's precomputed 1/||row||; either way the
+    score is one BLAS matrix-vector product (plus one elementwise scale).
+    Selection is O(N) with argpartition; only the k winners are sorted.
+    """
+    scores = matrix @ query
+    if inv_norms is not None:
+        scores *= inv_norms
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=scores.dtype)
+    if k < len(scores):
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return top, scores[top]
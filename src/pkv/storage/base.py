@@ -1,7 +1,10 @@
 """Abstract base class for vector stores and factory function."""
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class VectorStoreBase(ABC):
@@ -12,7 +15,7 @@ class VectorStoreBase(ABC):
         self,
         collection_name: str,
         ids: list[str],
-        embeddings: list[list[float]],
+        embeddings: "np.ndarray | list[list[float]]",
         documents: list[str],
         metadatas: list[dict[str, Any]] | None = None,
     ) -> None:
@@ -40,6 +43,16 @@ class VectorStoreBase(ABC):
     def has_id(self, collection_name: str, doc_id: str) -> bool:
         """Check if a document ID exists."""
 
+    def get_all_ids(self, collection_name: str = "documents") -> set[str]:
+        """Return all document IDs in a collection. Backends should override with a cheaper query."""
+        return set(self.get_all(collection_name)["ids"])
+
+    def existing_ids(self, collection_name: str, ids: list[str]) -> set[str]:
+        """Return the subset of ids already present in the collection."""
+        if not ids:
+            return set()
+        return set(ids) & self.get_all_ids(collection_name)
+
     @abstractmethod
     def get_or_create_collection(self, name: str = "documents") -> Any:
         """Get or create a collection. Returns a collection-like object."""
@@ -70,6 +83,9 @@ def get_vector_store(config: dict[str, Any]) -> VectorStoreBase:
             project=bq_cfg.get("project", "ozpr-reporting-dev"),
             dataset=bq_cfg.get("dataset", "dbt_oriol"),
             table=bq_cfg.get("table", "pkv_oriol"),
+            quantize=bq_cfg.get("quantize", False),
+            write_api=bq_cfg.get("write_api", False),
+            cache_dir=bq_cfg.get("cache_dir", "~/.cache/pkv"),
         )
     elif backend == "chromadb":
         from .chromadb import ChromaVectorStore
@@ -84,6 +100,9 @@ def get_vector_store(config: dict[str, Any]) -> VectorStoreBase:
             project=bq_cfg.get("project", "ozpr-reporting-dev"),
             dataset=bq_cfg.get("dataset", "dbt_oriol"),
             table=bq_cfg.get("table", "pkv_oriol"),
+            quantize=bq_cfg.get("quantize", False),
+            write_api=bq_cfg.get("write_api", False),
+            cache_dir=bq_cfg.get("cache_dir", "~/.cache/pkv"),
         )
         return DualVectorStore(primary=primary, secondary=secondary)
     else:
@@ -1,14 +1,29 @@
 """BigQuery vector store backend.
 
 Uses brute-force cosine similarity for <10K chunks (no VECTOR_INDEX needed).
+With ``quantize=True`` embeddings are stored as per-vector-scaled int8 BYTES
+instead of FLOAT64 arrays (4x less data to upload and scan).
 All GCP imports are lazy — this module is only loaded when storage_backend=bigquery.
 """
 
+import base64
 import json
+import os
+import tempfile
 import time
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any
 
+import numpy as np
+
+from .quantize import decode_int8, quantize_int8
+
+# Float embedding for a row, decoding int8 BYTES when the row is quantized
+_EMBEDDING_EXPR = """IF(ARRAY_LENGTH({t}.embedding) > 0, {t}.embedding, ARRAY(
+    SELECT IF(c > 127, c - 256, c) * {t}.embedding_scale
+    FROM UNNEST(TO_CODE_POINTS({t}.embedding_q)) c WITH OFFSET o ORDER BY o))"""
+
 
 def _get_bq_client(project: str):
     from google.cloud import bigquery
@@ -18,12 +33,29 @@ def _get_bq_client(project: str):
 class BigQueryVectorStore:
     """BigQuery-backed vector store with cosine similarity search."""
 
-    def __init__(self, project: str, dataset: str, table: str):
+    def __init__(
+        self,
+        project: str,
+        dataset: str,
+        table: str,
+        quantize: bool = False,
+        write_api: bool = False,
+        cache_dir: str | None = None,
+    ):
         self.project = project
         self.dataset = dataset
         self.table = table
         self.full_table = f"{project}.{dataset}.{table}"
+        self.quantize = quantize
+        # Insert through the Storage Write API default stream (gRPC +
+        # protobuf, pipelined) instead of the legacy JSON streaming endpoint
+        self.write_api = write_api
+        # get_all() snapshots (float32 .npy + rows .json), reused while the
+        # table's row count and latest created_at are unchanged
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else None
         self._client = None
+        self._write_client = None
+        self._row_class = None
         self._ensure_table()
 
     @property
@@ -43,14 +75,24 @@ class BigQueryVectorStore:
             bigquery.SchemaField("source", "STRING"),
             bigquery.SchemaField("metadata", "STRING"),  # JSON as string
             bigquery.SchemaField("embedding", "FLOAT64", mode="REPEATED"),
+            bigquery.SchemaField("embedding_q", "BYTES"),  # int8, when quantized
+            bigquery.SchemaField("embedding_scale", "FLOAT64"),
             bigquery.SchemaField("created_at", "TIMESTAMP"),
         ]
 
         table_ref = bigquery.Table(self.full_table, schema=schema)
         try:
-            self.client.get_table(self.full_table)
+            existing = self.client.get_table(self.full_table)
         except Exception:
             self.client.create_table(table_ref)
+            return
+
+        # Add quantization columns to tables created before they existed
+        names = {f.name for f in existing.schema}
+        missing = [f for f in schema if f.name not in names]
+        if missing:
+            existing.schema = list(existing.schema) + missing
+            self.client.update_table(existing, ["schema"])
 
     def get_or_create_collection(self, name: str = "documents") -> "BigQueryCollection":
         """Return a collection-like wrapper (for compatibility with code that calls collection.get())."""
@@ -60,7 +102,7 @@ class BigQueryVectorStore:
         self,
         collection_name: str,
         ids: list[str],
-        embeddings: list[list[float]],
+        embeddings: np.ndarray | list[list[float]],
         documents: list[str],
         metadatas: list[dict[str, Any]] | None = None,
     ) -> None:
@@ -69,31 +111,139 @@ class BigQueryVectorStore:
             return
 
         metadatas = metadatas or [{}] * len(ids)
-        now = datetime.now(timezone.utc).isoformat()
+        now = datetime.now(timezone.utc)
 
-        # Delete existing rows with these IDs first (upsert)
-        self.delete_by_ids(collection_name, ids)
+        # Upsert: delete rows with these IDs first. Check with a SELECT so
+        # the usual all-new batch doesn't queue a DML job on the table.
+        existing = self.existing_ids(collection_name, ids)
+        if existing:
+            self.delete_by_ids(collection_name, [i for i in ids if i in existing])
 
         rows = []
         for i, chunk_id in enumerate(ids):
             meta = metadatas[i] if i < len(metadatas) else {}
-            rows.append({
+            row = {
                 "chunk_id": chunk_id,
                 "content": documents[i] if i < len(documents) else "",
                 "title": meta.get("title", ""),
                 "source": meta.get("source", ""),
                 "metadata": json.dumps(meta),
-                "embedding": embeddings[i],
-                "created_at": now,
-            })
+            }
+            if self.quantize:
+                q, row["embedding_scale"] = quantize_int8(embeddings[i])
+                row["embedding"] = []
+                row["embedding_q"] = q.tobytes()  # raw for the proto BYTES field
+            else:
+                emb = embeddings[i]
+                row["embedding"] = emb.tolist() if hasattr(emb, "tolist") else list(emb)
+            rows.append(row)
+
+        if self.write_api:
+            self._append_rows(rows, now)
+            return
 
         # Insert in batches of 500
+        created_at = now.isoformat()
+        for row in rows:
+            row["created_at"] = created_at
+            if self.quantize:
+                # BigQuery JSON takes BYTES as base64
+                row["embedding_q"] = base64.b64encode(row["embedding_q"]).decode("ascii")
         for batch_start in range(0, len(rows), 500):
             batch = rows[batch_start:batch_start + 500]
             errors = self.client.insert_rows_json(self.full_table, batch)
             if errors:
                 raise RuntimeError(f"BigQuery insert errors: {errors}")
 
+    # Protobuf field layout for Storage Write API rows (created_at is epoch micros)
+    _ROW_FIELDS = [
+        ("chunk_id", "TYPE_STRING", False),
+        ("content", "TYPE_STRING", False),
+        ("title", "TYPE_STRING", False),
+        ("source", "TYPE_STRING", False),
+        ("metadata", "TYPE_STRING", False),
+        ("embedding", "TYPE_DOUBLE", True),
+        ("embedding_q", "TYPE_BYTES", False),
+        ("embedding_scale", "TYPE_DOUBLE", False),
+        ("created_at", "TYPE_INT64", False),
+    ]
+    # Keep each AppendRowsRequest well under the API's 10 MB limit
+    _APPEND_MAX_BYTES = 8 * 1024 * 1024
+
+    def _row_descriptor(self):
+        """Build (once) the DescriptorProto and message class for table rows."""
+        from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+
+        if self._row_class is None:
+            proto = descriptor_pb2.DescriptorProto(name="PkvRow")
+            for number, (name, type_name, repeated) in enumerate(self._ROW_FIELDS, start=1):
+                proto.field.add(
+                    name=name,
+                    number=number,
+                    type=getattr(descriptor_pb2.FieldDescriptorProto, type_name),
+                    label=(descriptor_pb2.FieldDescriptorProto.LABEL_REPEATED if repeated
+                           else descriptor_pb2.FieldDescriptorProto.LABEL_OPTIONAL),
+                )
+            file_proto = descriptor_pb2.FileDescriptorProto(name="pkv_row.proto", package="pkv", syntax="proto2")
+            file_proto.message_type.add().CopyFrom(proto)
+            pool = descriptor_pool.DescriptorPool()
+            pool.Add(file_proto)
+            desc = pool.FindMessageTypeByName("pkv.PkvRow")
+            if hasattr(message_factory, "GetMessageClass"):
+                row_class = message_factory.GetMessageClass(desc)
+            else:
+                row_class = message_factory.MessageFactory(pool).GetPrototype(desc)
+            self._row_class = (proto, row_class)
+        return self._row_class
+
+    def _append_rows(self, rows: list[dict[str, Any]], now: datetime) -> None:
+        """Write rows to the table's default stream, pipelining all requests."""
+        from google.cloud import bigquery_storage_v1
+        from google.cloud.bigquery_storage_v1 import types, writer
+
+        if self._write_client is None:
+            self._write_client = bigquery_storage_v1.BigQueryWriteClient()
+        proto, row_class = self._row_descriptor()
+        created_at = int(now.timestamp() * 1_000_000)
+
+        template = types.AppendRowsRequest()
+        template.write_stream = (
+            f"projects/{self.project}/datasets/{self.dataset}/tables/{self.table}/streams/_default"
+        )
+        proto_data = types.AppendRowsRequest.ProtoData()
+        proto_data.writer_schema = types.ProtoSchema(proto_descriptor=proto)
+        template.proto_rows = proto_data
+
+        def requests():
+            serialized: list[bytes] = []
+            size = 0
+            for row in rows:
+                msg = row_class(created_at=created_at, **{k: v for k, v in row.items() if v is not None})
+                data = msg.SerializeToString()
+                if serialized and size + len(data) > self._APPEND_MAX_BYTES:
+                    yield serialized
+                    serialized, size = [], 0
+                serialized.append(data)
+                size += len(data)
+            if serialized:
+                yield serialized
+
+        stream = writer.AppendRowsStream(self._write_client, template)
+        try:
+            futures = []
+            for serialized in requests():
+                request = types.AppendRowsRequest()
+                data = types.AppendRowsRequest.ProtoData()
+                data.rows = types.ProtoRows(serialized_rows=serialized)
+                request.proto_rows = data
+                futures.append(stream.send(request))
+            for future in futures:
+                response = future.result()
+                if response.row_errors:
+                    raise RuntimeError(f"BigQuery append errors: {list(response.row_errors)}")
+        finally:
+            stream.close()
+
     def query(
         self,
         collection_name: str,
@@ -101,33 +251,34 @@ class BigQueryVectorStore:
         n_results: int = 10,
     ) -> dict[str, Any]:
         """Cosine similarity search."""
-        # Build the embedding array literal
-        emb_str = ", ".join(str(v) for v in query_embedding)
+        from google.cloud.bigquery import ArrayQueryParameter, QueryJobConfig, ScalarQueryParameter
 
+        qemb = [float(v) for v in query_embedding]
+        # ML.DISTANCE is a single vectorized kernel per row, instead of
+        # correlated UNNEST subqueries for the dot product and both norms.
+        # COSINE distance is 1 - cosine_similarity, matching ChromaDB.
         sql = f"""
-        WITH query AS (
-            SELECT [{emb_str}] AS qemb
+        WITH vectors AS (
+            SELECT t.chunk_id, t.content, t.metadata, {_EMBEDDING_EXPR.format(t="t")} AS emb
+            FROM `{self.full_table}` t
         )
         SELECT
             t.chunk_id,
             t.content,
             t.metadata,
-            -- cosine distance (1 - cosine_similarity) to match ChromaDB convention
-            1.0 - (
-                (SELECT SUM(a * b) FROM UNNEST(t.embedding) a WITH OFFSET i
-                 JOIN UNNEST(q.qemb) b WITH OFFSET j ON i = j)
-                / NULLIF(
-                    SQRT((SELECT SUM(a * a) FROM UNNEST(t.embedding) a))
-                    * SQRT((SELECT SUM(b * b) FROM UNNEST(q.qemb) b)),
-                    0)
-            ) AS distance
-        FROM `{self.full_table}` t, query q
-        WHERE ARRAY_LENGTH(t.embedding) > 0
+            ML.DISTANCE(t.emb, @qemb, 'COSINE') AS distance
+        FROM vectors t
+        WHERE ARRAY_LENGTH(t.emb) = @dim
         ORDER BY distance ASC
-        LIMIT {n_results}
+        LIMIT @k
         """
+        job_config = QueryJobConfig(query_parameters=[
+            ArrayQueryParameter("qemb", "FLOAT64", qemb),
+            ScalarQueryParameter("dim", "INT64", len(qemb)),
+            ScalarQueryParameter("k", "INT64", n_results),
+        ])
 
-        result = self.client.query(sql).result()
+        result = self.client.query(sql, job_config=job_config).result()
         ids = []
         documents = []
         metadatas = []
@@ -150,8 +301,19 @@ class BigQueryVectorStore:
         }
 
     def get_all(self, collection_name: str = "documents") -> dict[str, Any]:
-        """Get all documents and embeddings."""
-        sql = f"SELECT chunk_id, content, metadata, embedding FROM `{self.full_table}`"
+        """Get all documents and embeddings.
+
+        With a cache_dir, a local snapshot is returned (embeddings as a
+        memory-mapped float32 matrix) when the table hasn't changed since it
+        was written; checking that costs one aggregate query.
+        """
+        key = self._snapshot_key() if self.cache_dir else None
+        if key:
+            cached = self._load_snapshot(key)
+            if cached is not None:
+                return cached
+
+        sql = f"SELECT chunk_id, content, metadata, embedding, embedding_q, embedding_scale FROM `{self.full_table}`"
         result = self.client.query(sql).result()
 
         ids = []
@@ -166,9 +328,54 @@ class BigQueryVectorStore:
                 metadatas.append(json.loads(row.metadata) if row.metadata else {})
             except (json.JSONDecodeError, TypeError):
                 metadatas.append({})
-            embeddings.append(list(row.embedding) if row.embedding else [])
+            embeddings.append(self._row_embedding(row))
+
+        data = {"ids": ids, "documents": documents, "metadatas": metadatas, "embeddings": embeddings}
+        if key:
+            self._save_snapshot(key, data)
+        return data
 
-        return {"ids": ids, "documents": documents, "metadatas": metadatas, "embeddings": embeddings}
+    def _snapshot_key(self) -> str | None:
+        sql = f"SELECT COUNT(*) AS n, UNIX_MICROS(MAX(created_at)) AS ts FROM `{self.full_table}`"
+        for row in self.client.query(sql).result():
+            return f"{row.n}-{row.ts or 0}"
+        return None
+
+    def _snapshot_paths(self, key: str) -> tuple[Path, Path]:
+        stem = f"bq-{self.full_table}-{key}"
+        return self.cache_dir / f"{stem}.npy", self.cache_dir / f"{stem}.json"
+
+    def _load_snapshot(self, key: str) -> dict[str, Any] | None:
+        emb_path, rows_path = self._snapshot_paths(key)
+        try:
+            rows = json.loads(rows_path.read_text())
+            embeddings = np.load(emb_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if len(embeddings) != len(rows["ids"]):
+            return None
+        return {**rows, "embeddings": embeddings}
+
+    def _save_snapshot(self, key: str, data: dict[str, Any]) -> None:
+        dims = {len(e) for e in data["embeddings"]}
+        if len(dims) != 1 or 0 in dims:
+            return  # mixed or missing embeddings don't fit one matrix
+        emb_path, rows_path = self._snapshot_paths(key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for stale in self.cache_dir.glob(f"bq-{self.full_table}-*"):
+                stale.unlink()
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".npy.tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.asarray(data["embeddings"], dtype=np.float32))
+            os.replace(tmp, emb_path)
+            rows = {k: data[k] for k in ("ids", "documents", "metadatas")}
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".json.tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(rows, f)
+            os.replace(tmp, rows_path)
+        except OSError:
+            pass
 
     def count(self, collection_name: str = "documents") -> int:
         sql = f"SELECT COUNT(*) as cnt FROM `{self.full_table}`"
@@ -186,6 +393,16 @@ class BigQueryVectorStore:
         result = self.client.query(sql, job_config=job_config).result()
         return sum(1 for _ in result) > 0
 
+    def get_all_ids(self, collection_name: str = "documents") -> set[str]:
+        sql = f"SELECT chunk_id FROM `{self.full_table}`"
+        return {row.chunk_id for row in self.client.query(sql).result()}
+
+    def existing_ids(self, collection_name: str, ids: list[str]) -> set[str]:
+        if not ids:
+            return set()
+        sql = f"SELECT chunk_id FROM `{self.full_table}` WHERE chunk_id IN UNNEST(@ids)"
+        return {row.chunk_id for row in self.client.query(sql, job_config=self._ids_job_config(ids)).result()}
+
     def get_by_ids(self, collection_name: str, ids: list[str], include: list[str] | None = None) -> dict[str, Any]:
         """Get documents by IDs."""
         if not ids:
@@ -198,11 +415,10 @@ class BigQueryVectorStore:
         if "metadatas" in include:
             cols.append("metadata")
         if "embeddings" in include:
-            cols.append("embedding")
+            cols.extend(["embedding", "embedding_q", "embedding_scale"])
 
-        placeholders = ", ".join(f"'{id_}'" for id_ in ids)
-        sql = f"SELECT {', '.join(cols)} FROM `{self.full_table}` WHERE chunk_id IN ({placeholders})"
-        result = self.client.query(sql).result()
+        sql = f"SELECT {', '.join(cols)} FROM `{self.full_table}` WHERE chunk_id IN UNNEST(@ids)"
+        result = self.client.query(sql, job_config=self._ids_job_config(ids)).result()
 
         out: dict[str, list] = {"ids": [], "documents": [], "metadatas": [], "embeddings": []}
         for row in result:
@@ -215,16 +431,30 @@ class BigQueryVectorStore:
                 except (json.JSONDecodeError, TypeError):
                     out["metadatas"].append({})
             if "embeddings" in include:
-                out["embeddings"].append(list(row.embedding) if row.embedding else [])
+                out["embeddings"].append(self._row_embedding(row))
 
         return out
 
+    @staticmethod
+    def _row_embedding(row) -> list[float]:
+        """Float embedding for a result row, dequantizing int8 rows."""
+        if row.embedding:
+            return list(row.embedding)
+        if row.embedding_q:
+            return decode_int8(row.embedding_q, row.embedding_scale or 1.0)
+        return []
+
     def delete_by_ids(self, collection_name: str, ids: list[str]) -> None:
         if not ids:
             return
-        placeholders = ", ".join(f"'{id_}'" for id_ in ids)
-        sql = f"DELETE FROM `{self.full_table}` WHERE chunk_id IN ({placeholders})"
-        self.client.query(sql).result()
+        sql = f"DELETE FROM `{self.full_table}` WHERE chunk_id IN UNNEST(@ids)"
+        self.client.query(sql, job_config=self._ids_job_config(ids)).result()
+
+    @staticmethod
+    def _ids_job_config(ids: list[str]):
+        """Pass chunk IDs as an array parameter instead of splicing them into SQL."""
+        from google.cloud.bigquery import ArrayQueryParameter, QueryJobConfig
+        return QueryJobConfig(query_parameters=[ArrayQueryParameter("ids", "STRING", list(ids))])
 
 
 class BigQueryCollection:
@@ -15,12 +15,18 @@ class ChromaVectorStore(VectorStoreBase):
         self.chroma_path = Path(chroma_path)
         self.chroma_path.mkdir(parents=True, exist_ok=True)
         self.client = chromadb.PersistentClient(path=str(self.chroma_path))
+        self._collections: dict[str, chromadb.Collection] = {}
 
     def get_or_create_collection(self, name: str = "documents") -> chromadb.Collection:
-        return self.client.get_or_create_collection(
-            name=name,
-            metadata={"hnsw:space": "cosine"},
-        )
+        """Return the named collection, creating it once per process."""
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self.client.get_or_create_collection(
+                name=name,
+                metadata={"hnsw:space": "cosine"},
+            )
+            self._collections[name] = collection
+        return collection
 
     def add_documents(
         self,
@@ -59,7 +65,7 @@ class ChromaVectorStore(VectorStoreBase):
         ids = self.get_all_ids(collection_name)
         return doc_id in ids
 
-    def get_all_ids(self, collection_name: str) -> set[str]:
+    def get_all_ids(self, collection_name: str = "documents") -> set[str]:
         """Return all IDs in a collection as a set (cached per call)."""
         cache_key = f"_ids_cache_{collection_name}"
         if not hasattr(self, cache_key):
@@ -68,6 +74,15 @@ class ChromaVectorStore(VectorStoreBase):
             setattr(self, cache_key, set(result["ids"]))
         return getattr(self, cache_key)
 
+    def existing_ids(self, collection_name: str, ids: list[str], shard_size: int = 1000) -> set[str]:
+        """Return the subset of ids already stored, querying in shards without payloads."""
+        collection = self.get_or_create_collection(collection_name)
+        found: set[str] = set()
+        for i in range(0, len(ids), shard_size):
+            result = collection.get(ids=ids[i:i + shard_size], include=[])
+            found.update(result["ids"])
+        return found
+
     def _invalidate_id_cache(self, collection_name: str):
         cache_key = f"_ids_cache_{collection_name}"
         if hasattr(self, cache_key):
@@ -14,9 +14,13 @@ from .base import VectorStoreBase
 logger = logging.getLogger(__name__)
 
 
-def _to_lists(embeddings: list) -> list[list[float]]:
-    """Convert numpy arrays to plain lists for JSON serialization."""
-    return [e.tolist() if isinstance(e, np.ndarray) else list(e) for e in embeddings]
+def _stack_embeddings(embeddings: "np.ndarray | list[list[float]]") -> np.ndarray:
+    """Stack embeddings into one contiguous float32 matrix (no copy if already one)."""
+    if isinstance(embeddings, np.ndarray):
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
+    if not len(embeddings):
+        return np.empty((0, 0), dtype=np.float32)
+    return np.ascontiguousarray(np.stack(embeddings), dtype=np.float32)
 
 
 class DualVectorStore(VectorStoreBase):
@@ -34,7 +38,7 @@ class DualVectorStore(VectorStoreBase):
         self,
         collection_name: str,
         ids: list[str],
-        embeddings: list[list[float]],
+        embeddings: np.ndarray | list[list[float]],
         documents: list[str],
         metadatas: list[dict[str, Any]] | None = None,
     ) -> None:
@@ -42,7 +46,7 @@ class DualVectorStore(VectorStoreBase):
         self.primary.add_documents(collection_name, ids, embeddings, documents, metadatas)
         # Then mirror to secondary
         try:
-            self.secondary.add_documents(collection_name, ids, _to_lists(embeddings), documents, metadatas)
+            self.secondary.add_documents(collection_name, ids, _stack_embeddings(embeddings), documents, metadatas)
         except Exception as e:
             logger.warning(f"Secondary store write failed (will retry on next sync): {e}")
 
@@ -63,6 +67,12 @@ class DualVectorStore(VectorStoreBase):
     def has_id(self, collection_name: str, doc_id: str) -> bool:
         return self.primary.has_id(collection_name, doc_id)
 
+    def get_all_ids(self, collection_name: str = "documents") -> set[str]:
+        return self.primary.get_all_ids(collection_name)
+
+    def existing_ids(self, collection_name: str, ids: list[str]) -> set[str]:
+        return self.primary.existing_ids(collection_name, ids)
+
     def get_by_ids(self, collection_name: str, ids: list[str], include: list[str] | None = None) -> dict[str, Any]:
         return self.primary.get_by_ids(collection_name, ids, include)
 
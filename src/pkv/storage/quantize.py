@@ -0,0 +1,29 @@
+"""Symmetric int8 quantization for embedding storage.
+
+Each vector gets its own scale (max abs value / 127), so unit-norm e5
+vectors keep near-identical cosine similarity at a quarter of the bytes.
+"""
+
+import base64
+
+import numpy as np
+
+
+def quantize_int8(vec) -> tuple[np.ndarray, float]:
+    """Quantize a float vector to int8. Returns (int8_array, scale)."""
+    arr = np.asarray(vec, dtype=np.float32)
+    max_abs = float(np.abs(arr).max()) if arr.size else 0.0
+    scale = max_abs / 127.0 if max_abs > 0 else 1.0
+    q = np.clip(np.rint(arr / scale), -127, 127).astype(np.int8)
+    return q, scale
+
+
+def dequantize_int8(q, scale: float) -> np.ndarray:
+    """Inverse of quantize_int8."""
+    return np.asarray(q, dtype=np.int8).astype(np.float32) * scale
+
+
+def decode_int8(data: bytes | str, scale: float) -> list[float]:
+    """Decode int8 BYTES (raw, or base64 as sent in JSON inserts) back to floats."""
+    raw = base64.b64decode(data) if isinstance(data, str) else data
+    return dequantize_int8(np.frombuffer(raw, dtype=np.int8), scale).tolist()
@@ -3,13 +3,21 @@
 All GCP imports are lazy. This module is only loaded when vault_sync=gdrive.
 """
 
-import hashlib
 import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
+from ..hashing import file_digest
 
-SYNC_STATE_FILE = ".gdrive_sync_state.json"
+# Append-only log of {"p": relative_path, "h": hash} records (h null = removed);
+# the last record for a path wins
+SYNC_STATE_FILE = ".gdrive_sync_state.jsonl"
+_LEGACY_STATE_FILE = ".gdrive_sync_state.json"
+_BATCH_SIZE = 100  # Drive's limit on requests per batch call
+_FILE_FIELDS = "files(id,md5Checksum)"
 
 
 class GDriveSync:
@@ -22,13 +30,18 @@ class GDriveSync:
             raise ValueError("gdrive.vault_folder_id must be set in config when vault_sync=gdrive")
         self.vault_path = Path(config["vault_path"])
         self.state_path = self.vault_path / SYNC_STATE_FILE
+        self._log_records = 0  # lines currently in the state log
+        self._log_damaged = False  # log has lines _load_state had to skip
         self._service = None
+        self._http = None
         self._folder_cache: dict[str, str] = {}  # relative_path -> drive folder id
 
     @property
     def service(self):
         if self._service is None:
             import google.auth
+            import httplib2
+            from google_auth_httplib2 import AuthorizedHttp
             from googleapiclient.discovery import build
 
             # ADC scopes are fixed at login time. Request broad scopes
@@ -40,24 +53,88 @@ class GDriveSync:
                     "https://www.googleapis.com/auth/drive",
                 ]
             )
-            self._service = build("drive", "v3", credentials=creds)
+            # One authorized transport for the whole sync: httplib2 keeps the
+            # TLS connection to googleapis.com open between requests
+            self._http = AuthorizedHttp(creds, http=httplib2.Http(timeout=60))
+            self._service = build("drive", "v3", http=self._http, cache_discovery=False)
         return self._service
 
     def _load_state(self) -> dict[str, str]:
         """Load sync state: {relative_path: content_hash}."""
-        if self.state_path.exists():
+        state: dict[str, str] = {}
+        self._log_records = 0
+        self._log_damaged = False
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        record = None  # torn final line from an interrupted append
+                    if not (
+                        isinstance(record, dict)
+                        and isinstance(record.get("p"), str)
+                        and isinstance(record.get("h"), (str, type(None)))
+                    ):
+                        # Skip it, and rewrite the log on the next save rather
+                        # than appending after a partial line
+                        self._log_damaged = True
+                        continue
+                    self._log_records += 1
+                    if record["h"] is None:
+                        state.pop(record["p"], None)
+                    else:
+                        state[record["p"]] = record["h"]
+            return state
+        except OSError:
+            pass
+        legacy = self.vault_path / _LEGACY_STATE_FILE
+        if legacy.exists():
             try:
-                return json.loads(self.state_path.read_text())
+                return json.loads(legacy.read_text())
             except (json.JSONDecodeError, OSError):
                 pass
-        return {}
+        return state
+
+    def _save_state(self, state: dict[str, str], previous: dict[str, str]):
+        """Append the changes since previous; compact once the log is 2x the state."""
+        deltas = [{"p": p, "h": h} for p, h in state.items() if previous.get(p) != h]
+        deltas += [{"p": p, "h": None} for p in previous if p not in state]
+        if (
+            self._log_damaged
+            or not self.state_path.exists()
+            or self._log_records + len(deltas) > 2 * max(len(state), 1)
+        ):
+            self._compact_state(state)
+        elif deltas:
+            with open(self.state_path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(d) + "\n" for d in deltas)
+            self._log_records += len(deltas)
 
-    def _save_state(self, state: dict[str, str]):
-        self.state_path.write_text(json.dumps(state, indent=2))
+    def _compact_state(self, state: dict[str, str]):
+        """Rewrite the log with one record per path (atomic rename)."""
+        fd, tmp = tempfile.mkstemp(dir=self.vault_path, prefix=".gdrive_sync_state.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps({"p": p, "h": h}) + "\n" for p, h in state.items())
+            os.replace(tmp, self.state_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self._log_records = len(state)
+        self._log_damaged = False
+        legacy = self.vault_path / _LEGACY_STATE_FILE
+        if legacy.exists():
+            legacy.unlink()
 
     @staticmethod
     def _file_hash(path: Path) -> str:
-        return hashlib.sha256(path.read_bytes()).hexdigest()
+        return file_digest(path, "sha256")
+
+    @staticmethod
+    def _file_md5(path: Path) -> str:
+        """MD5 as Drive reports it in md5Checksum."""
+        return file_digest(path, "md5")
 
     def _get_or_create_folder(self, name: str, parent_id: str) -> str:
         """Get or create a folder in Drive."""
@@ -87,6 +164,54 @@ class GDriveSync:
         self._folder_cache[cache_key] = folder_id
         return folder_id
 
+    def _list_folders(self, parent_id: str, page_token: str | None = None):
+        query = f"'{parent_id}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false"
+        return self.service.files().list(
+            q=query, fields="nextPageToken,files(id,name)", pageSize=1000, pageToken=page_token
+        )
+
+    def _prime_folder_cache(self):
+        """Load the whole Drive folder tree into _folder_cache, one batch call per level.
+
+        Folders whose listing fails are simply left out; _get_or_create_folder
+        looks those up itself.
+        """
+        level = [self.vault_folder_id]
+        while level:
+            children: list[str] = []
+            more_pages: list[tuple[str, str]] = []  # (parent_id, page token)
+
+            def add(parent_id: str, response: dict):
+                for folder in response.get("files", []):
+                    key = f"{parent_id}/{folder['name']}"
+                    if key not in self._folder_cache:
+                        self._folder_cache[key] = folder["id"]
+                        children.append(folder["id"])
+                if response.get("nextPageToken"):
+                    more_pages.append((parent_id, response["nextPageToken"]))
+
+            for start in range(0, len(level), _BATCH_SIZE):
+                parents = level[start:start + _BATCH_SIZE]
+
+                def callback(request_id, response, exception, parents=parents):
+                    if exception is None:
+                        add(parents[int(request_id)], response)
+
+                batch = self.service.new_batch_http_request(callback=callback)
+                for i, parent_id in enumerate(parents):
+                    batch.add(self._list_folders(parent_id), request_id=str(i))
+                try:
+                    batch.execute()
+                except Exception:
+                    pass
+            while more_pages:
+                parent_id, token = more_pages.pop()
+                try:
+                    add(parent_id, self._list_folders(parent_id, token).execute())
+                except Exception:
+                    pass
+            level = children
+
     def _ensure_folder_path(self, relative_dir: Path) -> str:
         """Create nested folder structure in Drive, returns final folder ID."""
         current_id = self.vault_folder_id
@@ -94,26 +219,51 @@ class GDriveSync:
             current_id = self._get_or_create_folder(part, current_id)
         return current_id
 
-    def _upload_file(self, local_path: Path, parent_folder_id: str):
-        """Upload or update a file in Drive."""
-        from googleapiclient.http import MediaFileUpload
-
-        name = local_path.name
-        # Check if file exists
+    def _find_file(self, name: str, parent_folder_id: str) -> dict[str, str] | None:
+        """{"id", "md5Checksum"} of the file called name in the folder, or None."""
         query = f"name='{name}' and '{parent_folder_id}' in parents and trashed=false"
-        results = self.service.files().list(q=query, fields="files(id)").execute()
+        results = self.service.files().list(q=query, fields=_FILE_FIELDS).execute()
         existing = results.get("files", [])
+        return existing[0] if existing else None
+
+    def _find_files(self, keys: list[tuple[str, str]]) -> dict[tuple[str, str], dict[str, str] | None]:
+        """Look up many (parent_folder_id, name) pairs in batched list calls.
+
+        Pairs whose lookup failed are left out, so callers can probe them singly.
+        """
+        found: dict[tuple[str, str], dict[str, str] | None] = {}
+
+        def callback(request_id, response, exception):
+            if exception is None:
+                files = response.get("files", [])
+                found[keys[int(request_id)]] = files[0] if files else None
+
+        for start in range(0, len(keys), _BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=callback)
+            for i in range(start, min(start + _BATCH_SIZE, len(keys))):
+                parent_id, name = keys[i]
+                query = f"name='{name}' and '{parent_id}' in parents and trashed=false"
+                batch.add(self.service.files().list(q=query, fields=_FILE_FIELDS), request_id=str(i))
+            try:
+                batch.execute()
+            except Exception:
+                pass  # unresolved pairs fall back to _find_file
+        return found
+
+    def _upload_file(self, local_path: Path, parent_folder_id: str, file_id: str | None):
+        """Upload a new file, or update file_id in place."""
+        from googleapiclient.http import MediaFileUpload
 
         media = MediaFileUpload(str(local_path), mimetype="text/markdown")
 
-        if existing:
+        if file_id:
             # Update
             self.service.files().update(
-                fileId=existing[0]["id"], media_body=media
+                fileId=file_id, media_body=media
             ).execute()
         else:
             # Create
-            metadata = {"name": name, "parents": [parent_folder_id]}
+            metadata = {"name": local_path.name, "parents": [parent_folder_id]}
             self.service.files().create(
                 body=metadata, media_body=media, fields="id"
             ).execute()
@@ -132,36 +282,65 @@ class GDriveSync:
             return {"uploaded": 0, "skipped": 0, "errors": 1}
 
         state = self._load_state()
-        new_state = {}
-        stats = {"uploaded": 0, "skipped": 0, "errors": 0}
+        new_state, changed = self._scan(state)
+        stats = {"uploaded": 0, "skipped": len(new_state) - len(changed), "errors": 0}
+        self._upload(changed, new_state, stats)
+        self._save_state(new_state, state)
+        return stats
 
-        for md_file in sorted(self.vault_path.rglob("*.md")):
-            if md_file.name.startswith("."):
-                continue
+    def _scan(self, state: dict[str, str]) -> tuple[dict[str, str], list[str]]:
+        """Hash the vault's notes. Returns (new state, relative paths changed since state)."""
+        md_files = [f for f in sorted(self.vault_path.rglob("*.md")) if not f.name.startswith(".")]
+        # Hashing is IO-bound and hashlib releases the GIL; uploads stay serial
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+            hashes = list(pool.map(self._file_hash, md_files))
 
-            rel = md_file.relative_to(self.vault_path)
-            rel_str = str(rel)
-            content_hash = self._file_hash(md_file)
-            new_state[rel_str] = content_hash
+        new_state = {str(f.relative_to(self.vault_path)): h for f, h in zip(md_files, hashes)}
+        changed = [rel for rel, h in new_state.items() if state.get(rel) != h]
+        return new_state, changed
 
-            # Skip if unchanged
-            if state.get(rel_str) == content_hash:
-                stats["skipped"] += 1
-                continue
+    def _upload(self, changed: list[str], new_state: dict[str, str], stats: dict[str, int]):
+        """Upload changed notes, clearing the state hash of any that fail."""
+
+        def record_error(rel_str: str, e: Exception):
+            import sys
 
+            stats["errors"] += 1
+            if stats["errors"] <= 3:  # Print first 3 errors
+                print(f"  ✗ {rel_str}: {e}", file=sys.stderr)
+            elif stats["errors"] == 4:
+                print("  ... (suppressing further errors)", file=sys.stderr)
+            # Don't save hash so it retries next time
+            new_state[rel_str] = ""
+
+        if any(Path(rel_str).parent != Path(".") for rel_str in changed):
+            try:
+                self._prime_folder_cache()
+            except Exception:
+                pass  # folders are then resolved one by one
+
+        pending = []  # (md_file, rel_str, parent_id)
+        for rel_str in changed:
+            rel = Path(rel_str)
             try:
                 parent_id = self._ensure_folder_path(rel.parent) if rel.parent != Path(".") else self.vault_folder_id
-                self._upload_file(md_file, parent_id)
+            except Exception as e:
+                record_error(rel_str, e)
+                continue
+            pending.append((self.vault_path / rel, rel_str, parent_id))
+
+        # Media uploads can't be batched, but the existence probes can
+        existing = self._find_files([(parent_id, md_file.name) for md_file, _, parent_id in pending])
+
+        for md_file, rel_str, parent_id in pending:
+            try:
+                key = (parent_id, md_file.name)
+                remote = existing[key] if key in existing else self._find_file(md_file.name, parent_id)
+                # Drive already holds these bytes (e.g. lost or reset sync state)
+                if remote and remote.get("md5Checksum") == self._file_md5(md_file):
+                    stats["skipped"] += 1
+                    continue
+                self._upload_file(md_file, parent_id, remote["id"] if remote else None)
                 stats["uploaded"] += 1
             except Exception as e:
-                stats["errors"] += 1
-                if stats["errors"] <= 3:  # Print first 3 errors
-                    import sys
-                    print(f"  ✗ {rel_str}: {e}", file=sys.stderr)
-                elif stats["errors"] == 4:
-                    print("  ... (suppressing further errors)", file=sys.stderr)
-                # Don't save hash so it retries next time
-                new_state[rel_str] = ""
-
-        self._save_state(new_state)
-        return stats
+                record_error(rel_str, e)
@@ -0,0 +1,29 @@
+"""Fast enumeration of the vault's markdown files."""
+
+import os
+from collections.abc import Iterator
+
+
+def iter_markdown_files(vault_path: str | os.PathLike) -> Iterator[os.DirEntry]:
+    """Yield a DirEntry for every .md file under vault_path.
+
+    Walks with os.scandir, so type checks come from the directory read rather
+    than a stat() per entry. Hidden files and folders (.obsidian, .trash, …)
+    are skipped without descending into them. Order matches Path.rglob:
+    a folder's own files, then its subfolders depth-first.
+    """
+    stack = [os.fspath(vault_path)]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.endswith(".md") and entry.is_file():
+                        yield entry
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
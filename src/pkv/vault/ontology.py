@@ -5,6 +5,22 @@ from typing import Any
 
 from ..config import load_ontology
 
+try:  # RE2's linear-time DFA engine when google-re2 is installed
+    import re2 as _regex
+except ImportError:
+    _regex = re
+
+_WIKILINK_RE = _regex.compile(r"\[\[([^\]]+)\]\]")
+# Capitalized phrases (2-4 words, likely proper nouns)
+_PROPER_RE = _regex.compile(r"\b([A-Z][a-z]+(?:\s[A-Z][a-z]+){1,3})\b")
+# Common false positives
+_STOPWORDS = frozenset({
+    "The", "This", "That", "These", "Those", "Monday", "Tuesday",
+    "Wednesday", "Thursday", "Friday", "Saturday", "Sunday",
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+})
+
 
 class OntologyManager:
     """Manages entity types and relationships from ontology config."""
@@ -36,21 +52,8 @@ class OntologyManager:
         - Capitalized multi-word phrases (potential names)
         - Existing wikilinks [[entity]]
         """
-        entities = set()
-
-        # Existing wikilinks
-        for match in re.finditer(r"\[\[([^\]]+)\]\]", text):
-            entities.add(match.group(1))
-
-        # Capitalized phrases (2-4 words, likely proper nouns)
-        for match in re.finditer(r"\b([A-Z][a-z]+(?:\s[A-Z][a-z]+){1,3})\b", text):
-            name = match.group(1)
-            # Filter out common false positives
-            if name not in {"The", "This", "That", "These", "Those", "Monday", "Tuesday",
-                           "Wednesday", "Thursday", "Friday", "Saturday", "Sunday",
-                           "January", "February", "March", "April", "May", "June",
-                           "July", "August", "September", "October", "November", "December"}:
-                entities.add(name)
+        entities = set(_WIKILINK_RE.findall(text))
+        entities.update(name for name in _PROPER_RE.findall(text) if name not in _STOPWORDS)
 
         return sorted(entities)
 
@@ -1,27 +1,41 @@
 """Markdown templates for vault documents."""
 
+import io
 from typing import Any
 
+import yaml
+
+# libyaml's C emitter when PyYAML was built with it
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 
 def render_frontmatter(data: dict[str, Any]) -> str:
     """Render YAML frontmatter block."""
-    import yaml
-    fm = yaml.dump(data, default_flow_style=False, allow_unicode=True, sort_keys=False)
-    return f"---\n{fm}---\n"
+    buf = io.StringIO()
+    _write_frontmatter(buf, data)
+    return buf.getvalue()
+
+
+def _write_frontmatter(buf: io.StringIO, data: dict[str, Any]) -> None:
+    """Write the frontmatter block into buf, streaming the YAML dump."""
+    buf.write("---\n")
+    yaml.dump(data, buf, Dumper=_YAML_DUMPER, default_flow_style=False, allow_unicode=True, sort_keys=False)
+    buf.write("---\n")
 
 
 def render_document(title: str, content: str, frontmatter: dict[str, Any], entities: list[str] | None = None) -> str:
     """Render a full vault document."""
-    parts = [render_frontmatter(frontmatter)]
-    parts.append(f"# {title}\n")
-    parts.append(content)
+    buf = io.StringIO()
+    _write_frontmatter(buf, frontmatter)
+    buf.write(f"\n# {title}\n\n")
+    buf.write(content)
 
     if entities:
-        parts.append("\n\n## Related Entities\n")
+        buf.write("\n\n\n## Related Entities\n")
         for entity in entities:
-            parts.append(f"- [[{entity}]]")
+            buf.write(f"\n- [[{entity}]]")
 
-    return "\n".join(parts)
+    return buf.getvalue()
 
 
 def render_entity_page(entity_name: str, entity_type: str, properties: dict[str, Any], icon: str = "📄") -> str:
@@ -35,33 +49,39 @@ def render_entity_page(entity_name: str, entity_type: str, properties: dict[str,
     if properties.get("description"):
         fm["description"] = properties["description"]
 
-    parts = [render_frontmatter(fm)]
-    parts.append(f"# {icon} {entity_name}\n")
-    parts.append(f"**Type:** {entity_type}\n")
+    buf = io.StringIO()
+    _write_frontmatter(buf, fm)
+
+    def add(part: str):
+        buf.write("\n")
+        buf.write(part)
+
+    add(f"# {icon} {entity_name}\n")
+    add(f"**Type:** {entity_type}\n")
 
     # Description
     if properties.get("description"):
-        parts.append(f"## Description\n")
-        parts.append(f"{properties['description']}\n")
+        add(f"## Description\n")
+        add(f"{properties['description']}\n")
 
     # Related entities as wikilinks
     if properties.get("related_entities"):
-        parts.append(f"## Related Entities\n")
+        add(f"## Related Entities\n")
         for entity in properties["related_entities"]:
-            parts.append(f"- [[{entity}]]")
-        parts.append("")
+            add(f"- [[{entity}]]")
+        add("")
 
     # Source documents as wikilinks
     if properties.get("source_documents"):
-        parts.append(f"## Source Documents\n")
+        add(f"## Source Documents\n")
         for doc in properties["source_documents"]:
-            parts.append(f"- [[{doc}]]")
-        parts.append("")
+            add(f"- [[{doc}]]")
+        add("")
 
     # Context (legacy/extra)
     if properties.get("context"):
-        parts.append(f"## Context\n")
-        parts.append(f"{properties['context']}\n")
+        add(f"## Context\n")
+        add(f"{properties['context']}\n")
 
     # Any remaining properties
     skip_keys = {"description", "related_entities", "source_documents", "context"}
@@ -69,11 +89,11 @@ def render_entity_page(entity_name: str, entity_type: str, properties: dict[str,
         if key in skip_keys or not value:
             continue
         if isinstance(value, list):
-            parts.append(f"## {key.replace('_', ' ').title()}\n")
+            add(f"## {key.replace('_', ' ').title()}\n")
             for item in value:
-                parts.append(f"- [[{item}]]" if isinstance(item, str) else f"- {item}")
-            parts.append("")
+                add(f"- [[{item}]]" if isinstance(item, str) else f"- {item}")
+            add("")
         else:
-            parts.append(f"**{key.replace('_', ' ').title()}:** {value}\n")
+            add(f"**{key.replace('_', ' ').title()}:** {value}\n")
 
-    return "\n".join(parts)
+    return buf.getvalue()
@@ -1,7 +1,9 @@
 """Write processed documents to the Obsidian vault."""
 
+import gzip
 import json
-import re
+import os
+import tempfile
 from pathlib import Path
 from typing import Any
 
@@ -9,6 +11,11 @@ from ..models import ProcessedDocument
 from .ontology import OntologyManager
 from .templates import render_document
 
+_FILENAME_STRIP = str.maketrans("", "", '<>:"/\\|?*')
+
+# Hash indexes larger than this are stored as .pkv_hashes.json.gz instead
+_GZIP_THRESHOLD = 1 << 20
+
 
 class VaultWriter:
     """Writes processed documents to an Obsidian-compatible vault."""
@@ -17,23 +24,53 @@ class VaultWriter:
         self.vault_path = Path(vault_path)
         self.ontology = ontology or OntologyManager()
         self._hashes_file = self.vault_path / ".pkv_hashes.json"
+        self._hashes_gz = self.vault_path / ".pkv_hashes.json.gz"
         self._hashes = self._load_hashes()
+        self._dir_index: dict[Path, set[str]] = {}  # target dir -> note stems in it
 
     def _load_hashes(self) -> dict[str, str]:
         """Load known content hashes to avoid duplicates."""
+        if self._hashes_gz.exists():
+            with gzip.open(self._hashes_gz, "rt", encoding="utf-8") as f:
+                return json.load(f)
         if self._hashes_file.exists():
             return json.loads(self._hashes_file.read_text())
         return {}
 
     def _save_hashes(self) -> None:
         self._hashes_file.parent.mkdir(parents=True, exist_ok=True)
-        self._hashes_file.write_text(json.dumps(self._hashes, indent=2))
+        data = json.dumps(self._hashes, indent=2).encode("utf-8")
+        target, stale = self._hashes_file, self._hashes_gz
+        if len(data) > _GZIP_THRESHOLD:
+            data = gzip.compress(data, compresslevel=1)
+            target, stale = stale, target
+        # Atomic replace so an interrupted save never truncates the index
+        fd, tmp = tempfile.mkstemp(dir=self._hashes_file.parent, prefix=".pkv_hashes.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, target)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        stale.unlink(missing_ok=True)
+
+    def flush(self) -> None:
+        """Persist the content-hash index."""
+        self._save_hashes()
 
     def write(self, doc: ProcessedDocument) -> Path | None:
         """Write a processed document to the vault.
 
         Returns the path of the written file, or None if duplicate.
         """
+        path = self._write_no_flush(doc)
+        if path:
+            self._save_hashes()
+        return path
+
+    def _write_no_flush(self, doc: ProcessedDocument) -> Path | None:
+        """write() without saving the hash index; the caller flushes."""
         # Dedup check
         if doc.content_hash in self._hashes:
             return None
@@ -46,11 +83,21 @@ class VaultWriter:
         safe_title = self._sanitize_filename(doc.title)
         file_path = target_dir / f"{safe_title}.md"
 
-        # Handle name collisions
+        # Handle name collisions: probe the directory index, then confirm on
+        # disk in case another writer created the file since it was listed
+        stems = self._dir_index.get(target_dir)
+        if stems is None:
+            with os.scandir(target_dir) as it:
+                stems = {e.name[:-3] for e in it if e.name.endswith(".md")}
+            self._dir_index[target_dir] = stems
+        stem = safe_title
         counter = 1
-        while file_path.exists():
-            file_path = target_dir / f"{safe_title}_{counter}.md"
+        while stem in stems or (target_dir / f"{stem}.md").exists():
+            stems.add(stem)
+            stem = f"{safe_title}_{counter}"
             counter += 1
+        stems.add(stem)
+        file_path = target_dir / f"{stem}.md"
 
         # Extract entities
         entities = self.ontology.extract_entities(doc.content)
@@ -74,22 +121,25 @@ class VaultWriter:
 
         # Record hash
         self._hashes[doc.content_hash] = str(file_path.relative_to(self.vault_path))
-        self._save_hashes()
 
         return file_path
 
     def write_many(self, docs: list[ProcessedDocument]) -> list[Path]:
         """Write multiple documents. Returns list of written paths."""
         paths = []
-        for doc in docs:
-            path = self.write(doc)
-            if path:
-                paths.append(path)
+        try:
+            for doc in docs:
+                path = self._write_no_flush(doc)
+                if path:
+                    paths.append(path)
+        finally:
+            # Saved once per batch, and also when a write fails part-way
+            if paths:
+                self._save_hashes()
         return paths
 
     @staticmethod
     def _sanitize_filename(name: str) -> str:
         """Sanitize a string for use as a filename."""
-        name = re.sub(r'[<>:"/\\|?*]', '', name)
-        name = name.strip(". ")
+        name = name.translate(_FILENAME_STRIP).strip(". ")
         return name[:100] if name else "untitled"
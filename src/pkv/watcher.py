@@ -1,5 +1,6 @@
 """File watcher for automatic ingestion pipeline."""
 
+import os
 import threading
 import time
 from pathlib import Path
@@ -21,16 +22,24 @@ class IngestHandler(FileSystemEventHandler):
     def __init__(self, debounce: float = 5.0):
         super().__init__()
         self._pending: set[str] = set()
+        # path -> (st_mtime_ns, st_size) when the callback last processed it
+        self._last_seen: dict[str, tuple[int, int]] = {}
         self._lock = threading.Lock()
         self._timer: threading.Timer | None = None
         self._debounce = debounce
         self._callback = None
 
     def set_callback(self, callback):
+        """callback(paths) may return paths that failed and should be retried."""
         self._callback = callback
 
     def _is_supported(self, path: str) -> bool:
-        return Path(path).suffix.lower() in SUPPORTED_EXTENSIONS
+        # Plain string ops: this runs for every event, and editors emit many
+        name = path[path.rfind(os.sep) + 1:]
+        if name.startswith("."):  # dotfiles, editor swap files, ._ forks
+            return False
+        i = name.rfind(".")
+        return i > 0 and name[i:].lower() in SUPPORTED_EXTENSIONS
 
     def on_created(self, event):
         if not event.is_directory and self._is_supported(event.src_path):
@@ -40,6 +49,16 @@ class IngestHandler(FileSystemEventHandler):
         if not event.is_directory and self._is_supported(event.src_path):
             self._add(event.src_path)
 
+    def on_deleted(self, event):
+        with self._lock:
+            self._last_seen.pop(event.src_path, None)
+
+    def on_moved(self, event):
+        with self._lock:
+            self._last_seen.pop(event.src_path, None)
+        if not event.is_directory and self._is_supported(event.dest_path):
+            self._add(event.dest_path)
+
     def _add(self, path: str):
         with self._lock:
             self._pending.add(path)
@@ -52,10 +71,32 @@ class IngestHandler(FileSystemEventHandler):
 
     def _flush(self):
         with self._lock:
-            paths = list(self._pending)
+            pending = list(self._pending)
             self._pending.clear()
-        if paths and self._callback:
-            self._callback(paths)
+        # Editors fire several modified events per save (and some for mere
+        # touches); skip files whose mtime and size haven't changed since the
+        # last batch, and files that are already gone
+        seen: dict[str, tuple[int, int]] = {}
+        for path in pending:
+            try:
+                st = os.stat(path)
+            except OSError:
+                with self._lock:
+                    self._last_seen.pop(path, None)
+                continue
+            key = (st.st_mtime_ns, st.st_size)
+            if self._last_seen.get(path) != key:
+                seen[path] = key
+        if not seen or not self._callback:
+            return
+        # Only remember files once they went through, so a batch that crashed
+        # (or files that failed to ingest) are retried on the next event
+        try:
+            failed = set(self._callback(list(seen)) or ())
+        except Exception:
+            return
+        with self._lock:
+            self._last_seen.update((p, k) for p, k in seen.items() if p not in failed)
 
 
 class FileWatcher:
@@ -74,15 +115,16 @@ class FileWatcher:
         import sys
         import traceback
         try:
-            self._process_batch_inner(paths)
+            return self._process_batch_inner(paths)
         except Exception as e:
             print(f"BATCH CRASHED: {e}", flush=True)
             traceback.print_exc()
             sys.stdout.flush()
             sys.stderr.flush()
+            raise
 
-    def _process_batch_inner(self, paths: list[str]):
-        """Actual batch processing logic."""
+    def _process_batch_inner(self, paths: list[str]) -> list[str]:
+        """Actual batch processing logic. Returns paths that didn't make it into the vault."""
         from .ingest.processor import process_file
         from .vault.writer import VaultWriter
         from .embeddings.embedder import Embedder
@@ -92,18 +134,22 @@ class FileWatcher:
 
         # 1. Ingest
         docs = []
+        ingested = []
+        failed = []
         for p in paths:
             try:
                 doc = process_file(Path(p), self.config)
                 if doc:
                     docs.append(doc)
+                    ingested.append(p)
                     console.print(f"  [green]✓ Ingested: {Path(p).name}[/]")
             except Exception as e:
+                failed.append(p)
                 console.print(f"  [red]✗ Failed to ingest {Path(p).name}: {e}[/]")
 
         if not docs:
             console.print("[yellow]No documents to process.[/]")
-            return
+            return failed
 
         # 2. Write to vault
         try:
@@ -112,6 +158,7 @@ class FileWatcher:
             console.print(f"  [green]✓ Wrote {len(written)} document(s) to vault[/]")
         except Exception as e:
             console.print(f"  [red]✗ Vault write failed: {e}[/]")
+            failed.extend(ingested)
             # Don't return — still try to embed existing vault files
 
         # 3. Embed
@@ -173,10 +220,20 @@ class FileWatcher:
         import sys
         sys.stdout.flush()
         sys.stderr.flush()
+        return failed
 
     def run(self):
         """Start watching (blocks until Ctrl+C)."""
         self.ingest_path.mkdir(parents=True, exist_ok=True)
+
+        # Keep the embedding model loaded across batches (and for other pkv commands)
+        embed_server = None
+        try:
+            from .daemon import start_background
+            embed_server = start_background(self.config)
+        except Exception as e:
+            console.print(f"[dim]  Embedding daemon not started: {e}[/]")
+
         self.observer.schedule(self.handler, str(self.ingest_path), recursive=True)
         self.observer.start()
 
@@ -191,4 +248,7 @@ class FileWatcher:
             console.print("\n[yellow]Stopping watcher...[/]")
             self.observer.stop()
         self.observer.join()
+        if embed_server is not None:
+            embed_server.shutdown()
+            embed_server.server_close()
         console.print("[green]✓ Watcher stopped.[/]")
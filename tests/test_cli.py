@@ -0,0 +1,25 @@
+"""Tests for the command-line interface."""
+
+import sys
+import types
+
+from click.testing import CliRunner
+
+from pkv import cli as cli_mod
+
+
+def test_ask_streams_answer_and_prints_sources(monkeypatch):
+    def fake_stream(question, config, n_chunks=10, since=None):
+        return iter(["Alice ", "met Bob."]), ["Meeting notes", "Journal"]
+
+    # Stand-in for pkv.qa, so the test needs neither the SDK nor a vector store
+    qa = types.ModuleType("pkv.qa")
+    qa.ask_question_stream = fake_stream
+    monkeypatch.setitem(sys.modules, "pkv.qa", qa)
+    monkeypatch.setattr(cli_mod, "_get_config", lambda ctx: {})
+
+    result = CliRunner().invoke(cli_mod.cli, ["ask", "Who did Alice meet?"])
+    assert result.exit_code == 0, result.output
+    assert "met Bob." in result.output
+    assert "[[Meeting notes]]" in result.output
+    assert "[[Journal]]" in result.output
@@ -0,0 +1,53 @@
+"""Tests for the approximate (HNSW + HDBSCAN) clustering path."""
+
+import numpy as np
+import pytest
+
+from pkv.clustering import cluster
+
+
+def test_knn_graph_masks_self_matches_anywhere_in_the_row():
+    # Point 0 and 1 are exact duplicates: HNSW returned 1 before 0 itself.
+    # Point 2 never found itself, so its first k results are all kept.
+    neighbors = np.array([[1, 0, 2], [1, 0, 2], [0, 1, 2]])
+    distances = np.array([[0.0, 0.0, 0.5], [0.0, 0.0, 0.5], [0.5, 0.5, 0.9]], dtype=np.float32)
+    graph = cluster._knn_graph(neighbors, distances, k=2).toarray()
+    assert np.all(np.diag(graph) == 0)
+    assert graph[0, 1] == graph[1, 0] == pytest.approx(1e-10)
+    assert graph[0, 2] == graph[2, 0] == pytest.approx(0.5)
+    assert graph[1, 2] == pytest.approx(0.5)
+
+
+class _FakeStore:
+    def __init__(self, embeddings):
+        self.data = {
+            "ids": [f"c{i}" for i in range(len(embeddings))],
+            "embeddings": embeddings,
+            "metadatas": None,
+        }
+
+    def get_all(self, collection_name="documents"):
+        return self.data
+
+
+def test_ann_path_separates_duplicate_and_disconnected_groups(monkeypatch):
+    pytest.importorskip("hnswlib")
+    rng = np.random.default_rng(0)
+    dim = 16
+    # Group A: exact duplicates (re-ingested notes); B and C: tight,
+    # mutually orthogonal clouds that share no kNN edges
+    dup = np.zeros(dim, dtype=np.float32)
+    dup[0] = 1
+    groups = [np.tile(dup, (10, 1))]
+    for axis in (5, 10):
+        center = np.zeros(dim, dtype=np.float32)
+        center[axis] = 1
+        groups.append(center + rng.normal(scale=0.01, size=(10, dim)).astype(np.float32))
+    embeddings = np.vstack(groups)
+
+    monkeypatch.setattr(cluster, "get_vector_store", lambda config: _FakeStore(embeddings))
+    config = {"clustering": {"ann_threshold": 5, "min_samples": 3, "min_cluster_size": 3}}
+    results = cluster.run_clustering(config)
+
+    members = sorted(sorted(int(i[1:]) for i in r.document_ids) for r in results)
+    assert members == [list(range(0, 10)), list(range(10, 20)), list(range(20, 30))]
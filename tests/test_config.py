@@ -0,0 +1,38 @@
+"""Tests for configuration loading."""
+
+import os
+import tempfile
+from pathlib import Path
+
+from pkv.config import DEFAULT_CONFIG, load_config
+
+
+def test_load_config_json_cache():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cfg_file = Path(tmpdir) / "config.yaml"
+        cfg_file.write_text("claude_model: first\n")
+
+        cfg = load_config(cfg_file)
+        assert cfg["claude_model"] == "first"
+        assert cfg["clustering"]["min_samples"] == 3
+        assert (Path(tmpdir) / ".config.json").exists()
+
+        # Cached load returns the same result
+        assert load_config(cfg_file)["claude_model"] == "first"
+
+        # Editing the YAML invalidates the cache
+        cfg_file.write_text("claude_model: second\n")
+        st = cfg_file.stat()
+        os.utime(cfg_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert load_config(cfg_file)["claude_model"] == "second"
+
+
+def test_load_config_merges_sections_without_mutating_defaults():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cfg_file = Path(tmpdir) / "config.yaml"
+        cfg_file.write_text("clustering:\n  xi: 0.1\n")
+
+        cfg = load_config(cfg_file)
+        assert cfg["clustering"]["xi"] == 0.1
+        assert cfg["clustering"]["min_samples"] == 3
+        assert DEFAULT_CONFIG["clustering"]["xi"] == 0.05
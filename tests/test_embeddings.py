@@ -0,0 +1,130 @@
+"""Tests for Embedder's skip logic and store writes, against an in-memory store."""
+
+import numpy as np
+import pytest
+
+from pkv.embeddings import embedder as embedder_mod
+from pkv.models import Chunk, ProcessedDocument
+
+
+class MemoryStore:
+    """Just enough of VectorStoreBase for Embedder.embed_documents."""
+
+    def __init__(self, fail_on_call: int | None = None):
+        self.rows: dict[str, dict] = {}
+        self.add_calls: list[list[str]] = []
+        self.lookups = {"existing_ids": 0, "get_all_ids": 0}
+        self.fail_on_call = fail_on_call
+
+    def add_documents(self, collection_name, ids, embeddings, documents, metadatas=None):
+        self.add_calls.append(list(ids))
+        if self.fail_on_call is not None and len(self.add_calls) == self.fail_on_call:
+            raise ConnectionError("store went away")
+        for i, chunk_id in enumerate(ids):
+            self.rows[chunk_id] = dict(metadatas[i])
+
+    def existing_ids(self, collection_name, ids):
+        self.lookups["existing_ids"] += 1
+        return {i for i in ids if i in self.rows}
+
+    def get_all_ids(self, collection_name="documents"):
+        self.lookups["get_all_ids"] += 1
+        return set(self.rows)
+
+    def get_by_ids(self, collection_name, ids, include=None):
+        found = [i for i in ids if i in self.rows]
+        return {"ids": found, "metadatas": [self.rows[i] for i in found]}
+
+
+class FakeModel:
+    def encode(self, texts, batch_size=32, **_kwargs):
+        return np.ones((len(texts), 4), dtype=np.float32) / 2
+
+
+@pytest.fixture
+def make_embedder(monkeypatch):
+    def make(store, **config):
+        monkeypatch.setattr(embedder_mod, "get_vector_store", lambda cfg: store)
+        e = embedder_mod.Embedder({"embed_batch_size": 1, **config})
+        e._model = FakeModel()
+        return e
+
+    return make
+
+
+def _doc(name="a", n_chunks=3, content_hash="h1"):
+    return ProcessedDocument(
+        title=name,
+        content="x",
+        chunks=[Chunk(content=f"{name} chunk {i}" + "." * i, index=i) for i in range(n_chunks)],
+        source_path=f"/vault/{name}.md",
+        source_type="markdown",
+        content_hash=content_hash,
+    )
+
+
+def _marker_id(store):
+    return next(i for i, meta in store.rows.items() if meta["chunk_index"] == 0)
+
+
+@pytest.mark.parametrize("cache_known_ids", [True, False])
+def test_first_chunk_is_written_last_and_marks_the_document_complete(cache_known_ids, make_embedder):
+    store = MemoryStore()
+    assert make_embedder(store, cache_known_ids=cache_known_ids).embed_documents([_doc()]) == 3
+    marker = _marker_id(store)
+    assert store.add_calls[-1] == [marker]
+    assert store.rows[marker]["chunk_count"] == 3
+    assert all("chunk_count" not in m for i, m in store.rows.items() if i != marker)
+
+    # A fresh run skips the document from its marker alone: only the probe is
+    # looked up, and nothing is written
+    store.lookups = dict.fromkeys(store.lookups, 0)
+    assert make_embedder(store, cache_known_ids=cache_known_ids).embed_documents([_doc()]) == 0
+    assert len(store.add_calls) == 3
+    assert sum(store.lookups.values()) == 1
+
+
+def test_legacy_chunks_without_chunk_count_fall_back_to_per_chunk_checks(make_embedder):
+    store = MemoryStore()
+    make_embedder(store).embed_documents([_doc()])
+    for meta in store.rows.values():
+        meta.pop("chunk_count", None)  # as written before chunk_count existed
+    missing = next(i for i, m in store.rows.items() if m["chunk_index"] == 2)
+    del store.rows[missing]
+
+    assert make_embedder(store).embed_documents([_doc()]) == 1
+    assert store.add_calls[-1] == [missing]
+
+
+def test_interrupted_run_leaves_document_incomplete_and_propagates_the_error(make_embedder):
+    store = MemoryStore(fail_on_call=3)  # the marker batch fails
+    with pytest.raises(ConnectionError):
+        make_embedder(store).embed_documents([_doc()])
+    assert len(store.rows) == 2
+    assert all(m["chunk_index"] != 0 for m in store.rows.values())
+
+    store.fail_on_call = None
+    assert make_embedder(store).embed_documents([_doc()]) == 1
+    assert store.rows[_marker_id(store)]["chunk_count"] == 3
+
+
+def test_writer_errors_stop_encoding_further_batches(make_embedder):
+    store = MemoryStore(fail_on_call=1)
+    with pytest.raises(ConnectionError):
+        make_embedder(store).embed_documents([_doc(n_chunks=20)])
+    # The encoder loop stops once the writer reports a failure; the bounded
+    # queue means at most a handful of batches were in flight
+    assert len(store.add_calls) == 1
+    assert store.rows == {}
+
+
+def test_known_ids_cache_loads_once_and_tracks_writes(make_embedder):
+    store = MemoryStore()
+    e = make_embedder(store, cache_known_ids=True)
+    e.embed_documents([_doc("a")])
+    assert e._known_ids["documents"] == set(store.rows)
+    e.embed_documents([_doc("a"), _doc("b", content_hash="h2")])
+    assert store.lookups["get_all_ids"] == 1
+    assert store.lookups["existing_ids"] == 0
+    assert e._known_ids["documents"] == set(store.rows)
+    assert len(store.rows) == 6
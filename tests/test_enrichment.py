@@ -0,0 +1,43 @@
+"""Tests for cluster enrichment."""
+
+import tempfile
+from pathlib import Path
+
+from pkv.enrichment.enricher import Enricher
+from pkv.models import ClusterResult
+from pkv.vault.ontology import OntologyManager
+
+
+class _EmptyStore:
+    def get_by_ids(self, collection, ids, include=None):
+        return {"ids": [], "documents": [], "metadatas": []}
+
+
+def _enricher(vault_path: str) -> Enricher:
+    # Bypass __init__: no API key or client is needed once _enrich_one is faked
+    enricher = Enricher.__new__(Enricher)
+    enricher.config = {"vault_path": vault_path, "enrichment": {"concurrency": 2}}
+    enricher.store = _EmptyStore()
+    enricher.ontology = OntologyManager()
+    return enricher
+
+
+def test_malformed_entities_do_not_lose_results(monkeypatch):
+    replies = {
+        1: {"label": "Bad", "entities": ["Alice Smith"]},
+        2: {"label": "Good", "entities": [{"name": "Bob Jones", "type": "Person"}]},
+    }
+
+    def fake_enrich_one(self, cluster, by_id, max_docs):
+        return {**replies[cluster.cluster_id], "cluster_id": cluster.cluster_id}
+
+    monkeypatch.setattr(Enricher, "_enrich_one", fake_enrich_one)
+    with tempfile.TemporaryDirectory() as vault:
+        clusters = [ClusterResult(cluster_id=i, document_ids=[f"d{i}"]) for i in (1, 2)]
+        results = _enricher(vault).enrich_clusters(clusters)
+
+        assert [r["cluster_id"] for r in results] == [1, 1, 2]
+        assert results[0]["label"] == "Bad"
+        assert "error" in results[1]
+        assert results[2]["label"] == "Good"
+        assert list(Path(vault).rglob("Bob Jones.md"))
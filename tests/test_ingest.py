@@ -1,8 +1,10 @@
 """Tests for the ingestion pipeline."""
 
+import hashlib
 import tempfile
 from pathlib import Path
 
+from pkv.hashing import file_digest
 from pkv.ingest.processor import process_file, compute_hash
 from pkv.ingest.chunker import chunk_text, estimate_tokens
 from pkv.config import DEFAULT_CONFIG
@@ -11,6 +13,12 @@ from pkv.config import DEFAULT_CONFIG
 def test_compute_hash():
     assert compute_hash("hello") == compute_hash("hello")
     assert compute_hash("hello") != compute_hash("world")
+    assert compute_hash(b"hello") == compute_hash("hello")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "f.txt"
+        path.write_bytes("héllo".encode("utf-8"))
+        assert compute_hash(path) == compute_hash("héllo")
+        assert file_digest(path, "md5") == hashlib.md5("héllo".encode("utf-8")).hexdigest()
 
 
 def test_estimate_tokens():
@@ -60,6 +68,19 @@ def test_process_json():
         assert doc.source_type == "json"
 
 
+def test_parse_chatgpt_export_orders_messages():
+    from pkv.ingest.parsers.json_parser import JsonParser
+
+    export = [{"title": "Chat", "mapping": {
+        "b": {"message": {"author": {"role": "assistant"}, "create_time": 2, "content": {"parts": ["Hi there"]}}},
+        "a": {"message": {"author": {"role": "user"}, "create_time": 1, "content": {"parts": ["Hello", {"x": 1}]}}},
+        "root": {"message": None},
+    }}]
+    result = JsonParser()._parse_chatgpt(export, "export")
+    assert result["title"] == "Chat"
+    assert result["content"].index("**user**: Hello") < result["content"].index("**assistant**: Hi there")
+
+
 def test_unsupported_format():
     with tempfile.NamedTemporaryFile(suffix=".xyz", mode="w", delete=False) as f:
         f.write("unsupported")
@@ -75,3 +96,124 @@ def test_idempotent_hashing():
         doc1 = process_file(Path(f.name), DEFAULT_CONFIG)
         doc2 = process_file(Path(f.name), DEFAULT_CONFIG)
         assert doc1.content_hash == doc2.content_hash
+
+
+def test_process_directory_recursive():
+    from pkv.ingest.processor import process_directory
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / "sub").mkdir()
+        (root / "a.md").write_text("# A\n\nFirst.")
+        (root / "sub" / "b.txt").write_text("B\nSecond.")
+        (root / ".hidden.md").write_text("# Hidden")
+        docs = process_directory(root, DEFAULT_CONFIG)
+        assert [Path(d.source_path).name for d in docs] == ["a.md", "b.txt"]
+
+
+def _write_pdf(path: Path, page_texts: list[str]) -> None:
+    """Write a minimal PDF with one Helvetica text line per page."""
+    n = len(page_texts)
+    # 1: catalog, 2: pages, 3: font, then a (page, content) pair per page
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(n))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {n} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(page_texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (num, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+def test_pdf_sequential_reads_file_once(monkeypatch):
+    import pypdf
+    from pkv.ingest.parsers.pdf import PdfParser
+
+    opened = []
+    real_reader = pypdf.PdfReader
+    monkeypatch.setattr(pypdf, "PdfReader", lambda *a, **k: opened.append(a) or real_reader(*a, **k))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "short.pdf"
+        _write_pdf(path, [f"Page {i}" for i in range(3)])
+        result = PdfParser().parse(path)
+    assert result["content"] == "Page 0\n\nPage 1\n\nPage 2"
+    assert result["metadata"]["page_count"] == 3
+    assert len(opened) == 1
+
+
+def test_pdf_parallel_split_keeps_page_order(monkeypatch):
+    from pkv.ingest.parsers import pdf
+
+    monkeypatch.setattr(pdf.os, "cpu_count", lambda: 3)
+    texts = [f"Page {i}" for i in range(pdf._PARALLEL_MIN_PAGES + 5)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "long.pdf"
+        _write_pdf(path, texts)
+        pages = pdf.PdfParser._extract_parallel(path, len(texts))
+        assert pages == texts
+        assert pdf.PdfParser().parse(path)["content"] == "\n\n".join(texts)
+
+
+def _parse_html(tmp: str, name: str, markup: str) -> dict:
+    from pkv.ingest.parsers.html import HtmlParser
+
+    path = Path(tmp) / name
+    path.write_text(markup, encoding="utf-8")
+    return HtmlParser().parse(path)
+
+
+def test_html_drops_chrome_scripts_and_comments_but_keeps_tail_text():
+    markup = (
+        "<html><head><title> My Page </title><style>p { color: red }</style></head>"
+        "<body><nav>Menu</nav>After nav<p>Hello <b>bold</b> world</p>"
+        "<script>var x = 1;</script>Tail text<!-- a comment -->"
+        "<footer>Footer</footer><p>Last</p></body></html>"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        result = _parse_html(tmp, "page.html", markup)
+    assert result["title"] == "My Page"
+    # Same lines BeautifulSoup's get_text(separator="\n", strip=True) gave
+    assert result["content"] == "My Page\nAfter nav\nHello\nbold\nworld\nTail text\nLast"
+
+
+def test_html_title_falls_back_to_file_stem():
+    with tempfile.TemporaryDirectory() as tmp:
+        assert _parse_html(tmp, "no-title.html", "<p>Body</p>")["title"] == "no-title"
+        blank = _parse_html(tmp, "blank-title.html", "<title>  </title><p>Body</p>")
+    assert blank["title"] == "blank-title"
+    assert blank["content"] == "Body"
+
+
+def test_html_xhtml_with_encoding_declaration():
+    markup = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Strict//EN" '
+        '"http://www.w3.org/TR/xhtml1/DTD/xhtml1-strict.dtd">\n'
+        '<html xmlns="http://www.w3.org/1999/xhtml"><head><title>Café</title></head>'
+        "<body><p>Ünïcode café</p></body></html>"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        result = _parse_html(tmp, "page.xhtml.html", markup)
+    assert result["title"] == "Café"
+    assert result["content"] == "Café\nÜnïcode café"
+
+
+def test_html_empty_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        for markup in ("", "  \n"):
+            result = _parse_html(tmp, "empty.html", markup)
+            assert result == {"content": "", "metadata": {"source_type": "html"}, "title": "empty"}
@@ -0,0 +1,102 @@
+"""Tests for the vault janitor."""
+
+import os
+import tempfile
+from pathlib import Path
+
+from pkv.maintenance import janitor
+
+
+def _note(path: Path, content_hash: str, body: str = "Body", extra: str = "") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\ntitle: {path.stem}\n{extra}content_hash: {content_hash}\n---\n\n{body}\n")
+    return path
+
+
+def _survivors(*paths: Path) -> list[Path]:
+    return [p for p in paths if p.exists()]
+
+
+def _count_reads(monkeypatch) -> list:
+    reads = []
+    real = janitor._read_frontmatter
+    monkeypatch.setattr(janitor, "_read_frontmatter", lambda path, *a: reads.append(path.name) or real(path, *a))
+    return reads
+
+
+def test_duplicates_removed_and_cache_reused(monkeypatch):
+    with tempfile.TemporaryDirectory() as vault:
+        root = Path(vault)
+        first = _note(root / "a" / "one.md", "h1")
+        dup = _note(root / "b" / "two.md", "h1")
+        other = _note(root / "b" / "three.md", "h2")
+        (root / "bare.md").write_text("No frontmatter here")
+        config = {"vault_path": vault}
+
+        stats = janitor.run_janitor(config)
+        assert stats["duplicates_removed"] == 1
+        assert stats["frontmatter_fixed"] == 1
+        # Which copy is kept follows directory order, as with rglob
+        assert len(_survivors(first, dup)) == 1 and other.exists()
+        assert (root / "bare.md").read_text().startswith("---\n")
+
+        # Unchanged second run: every note comes from the cache, nothing is deleted
+        reads = _count_reads(monkeypatch)
+        stats = janitor.run_janitor(config)
+        assert reads == []
+        assert stats == {"duplicates_removed": 0, "frontmatter_fixed": 0, "orphans_found": 0}
+        assert len(_survivors(first, dup)) == 1 and other.exists()
+
+
+def test_edited_note_invalidates_its_cache_entry(monkeypatch):
+    with tempfile.TemporaryDirectory() as vault:
+        root = Path(vault)
+        keep = _note(root / "keep.md", "h1")
+        edited = _note(root / "zz_edited.md", "h2")
+        config = {"vault_path": vault}
+        janitor.run_janitor(config)
+
+        # Re-hashed to duplicate keep.md, with the mtime left as it was
+        st = edited.stat()
+        _note(edited, "h1", body="Body, edited")
+        os.utime(edited, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        reads = _count_reads(monkeypatch)
+        assert janitor.run_janitor(config)["duplicates_removed"] == 1
+        assert reads == ["zz_edited.md"]
+        assert len(_survivors(keep, edited)) == 1
+
+        # Same size, newer mtime: re-hashed away from the duplicate
+        survivor = _survivors(keep, edited)[0]
+        _note(survivor, "h3")
+        st = survivor.stat()
+        os.utime(survivor, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        reads.clear()
+        janitor.run_janitor(config)
+        assert reads == [survivor.name]
+        assert janitor._load_cache(root / janitor.FRONTMATTER_CACHE_FILE)[str(survivor)][2] == "h3"
+
+
+def test_frontmatter_longer_than_a_block():
+    with tempfile.TemporaryDirectory() as vault:
+        root = Path(vault)
+        summary = "summary: " + "word " * 1200 + "\n"  # about 6 KB before content_hash
+        first = _note(root / "a.md", "h1", extra=summary)
+        dup = _note(root / "b.md", "h1", extra=summary)
+        assert janitor._read_frontmatter(first).endswith("content_hash: h1\n")
+
+        assert janitor.run_janitor({"vault_path": vault})["duplicates_removed"] == 1
+        assert len(_survivors(first, dup)) == 1
+
+
+def test_read_frontmatter_edge_cases():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "n.md"
+        path.write_text("# No frontmatter")
+        assert janitor._read_frontmatter(path) is None
+        path.write_text("---\ntitle: never closed\n")
+        assert janitor._read_frontmatter(path) == ""
+        # Closing '---' straddling the block boundary
+        head = "---\n" + "x" * 8 + "\n"
+        path.write_text(head + "---\nbody")
+        assert janitor._read_frontmatter(path, block_size=len(head) + 1) == head[3:]
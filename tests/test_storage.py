@@ -0,0 +1,83 @@
+"""Tests for the BigQuery vector store's write paths (fake clients, no GCP)."""
+
+import base64
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from pkv.storage import bigquery as bq
+from pkv.storage.quantize import decode_int8, quantize_int8
+
+EMBEDDINGS = np.array([[0.5, -0.25, 1.0], [-1.0, 0.1, 0.0]], dtype=np.float32)
+
+
+class FakeClient:
+    def __init__(self):
+        self.inserted = []
+
+    def insert_rows_json(self, table, rows):
+        self.inserted.extend(rows)
+        return []
+
+
+def _store(monkeypatch, **kwargs) -> bq.BigQueryVectorStore:
+    client = FakeClient()
+    monkeypatch.setattr(bq, "_get_bq_client", lambda project: client)
+    monkeypatch.setattr(bq.BigQueryVectorStore, "_ensure_table", lambda self: None)
+    monkeypatch.setattr(bq.BigQueryVectorStore, "existing_ids", lambda self, name, ids: set())
+    return bq.BigQueryVectorStore("proj", "ds", "chunks", quantize=True, **kwargs)
+
+
+def _add(store):
+    store.add_documents("documents", ["a", "b"], EMBEDDINGS, ["doc a", "doc b"], [{"title": "A"}, {"title": "B"}])
+
+
+def test_json_insert_sends_base64_int8(monkeypatch):
+    store = _store(monkeypatch)
+    _add(store)
+
+    rows = store.client.inserted
+    assert [r["chunk_id"] for r in rows] == ["a", "b"]
+    for row, emb in zip(rows, EMBEDDINGS):
+        q, scale = quantize_int8(emb)
+        assert row["embedding"] == []
+        assert row["embedding_q"] == base64.b64encode(q.tobytes()).decode("ascii")
+        assert row["embedding_scale"] == scale
+        assert np.allclose(decode_int8(row["embedding_q"], scale), emb, atol=scale)
+
+
+def test_write_api_sends_raw_int8_bytes(monkeypatch):
+    pytest.importorskip("google.protobuf")
+    pytest.importorskip("google.cloud.bigquery_storage_v1")
+    from google.cloud import bigquery_storage_v1
+    from google.cloud.bigquery_storage_v1 import writer
+
+    sent = []
+
+    class FakeStream:
+        def __init__(self, client, template):
+            self.closed = False
+
+        def send(self, request):
+            sent.append(request)
+            return SimpleNamespace(result=lambda: SimpleNamespace(row_errors=[]))
+
+        def close(self):
+            self.closed = True
+
+    monkeypatch.setattr(bigquery_storage_v1, "BigQueryWriteClient", lambda: object())
+    monkeypatch.setattr(writer, "AppendRowsStream", FakeStream)
+    store = _store(monkeypatch, write_api=True)
+    _add(store)
+
+    assert store.client.inserted == []
+    _, row_class = store._row_descriptor()
+    serialized = [data for request in sent for data in request.proto_rows.rows.serialized_rows]
+    msgs = [row_class.FromString(data) for data in serialized]
+    assert [m.chunk_id for m in msgs] == ["a", "b"]
+    for msg, emb in zip(msgs, EMBEDDINGS):
+        q, scale = quantize_int8(emb)
+        assert msg.embedding_q == q.tobytes()
+        assert msg.embedding_scale == pytest.approx(scale)
+        assert list(msg.embedding) == []
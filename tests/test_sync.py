@@ -0,0 +1,94 @@
+"""Tests for the Drive sync state log."""
+
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from pkv.sync.gdrive import GDriveSync, SYNC_STATE_FILE, _LEGACY_STATE_FILE
+
+
+def _syncer(vault: str) -> GDriveSync:
+    return GDriveSync({"vault_path": vault, "gdrive": {"vault_folder_id": "root"}})
+
+
+def _log(vault: str) -> list:
+    return [json.loads(line) for line in (Path(vault) / SYNC_STATE_FILE).read_text().splitlines()]
+
+
+def test_legacy_json_state_is_migrated():
+    with tempfile.TemporaryDirectory() as vault:
+        legacy = Path(vault) / _LEGACY_STATE_FILE
+        legacy.write_text(json.dumps({"a.md": "h1", "b.md": "h2"}))
+        s = _syncer(vault)
+        state = s._load_state()
+        assert state == {"a.md": "h1", "b.md": "h2"}
+
+        s._save_state({**state, "c.md": "h3"}, state)
+        assert not legacy.exists()
+        assert _log(vault) == [{"p": "a.md", "h": "h1"}, {"p": "b.md", "h": "h2"}, {"p": "c.md", "h": "h3"}]
+        assert _syncer(vault)._load_state() == {"a.md": "h1", "b.md": "h2", "c.md": "h3"}
+
+
+def test_changes_are_appended_then_compacted():
+    with tempfile.TemporaryDirectory() as vault:
+        s = _syncer(vault)
+        base = {f"{i}.md": "h" for i in range(3)}
+        s._load_state()
+        s._save_state(base, {})  # first write compacts
+        assert len(_log(vault)) == 3
+
+        s = _syncer(vault)
+        previous = s._load_state()
+        s._save_state({**previous, "0.md": "h'"}, previous)
+        assert _log(vault)[-1] == {"p": "0.md", "h": "h'"}
+        assert len(_log(vault)) == 4
+
+        # Three more changes would take the log past 2x the state: compact
+        s = _syncer(vault)
+        previous = s._load_state()
+        s._save_state({p: "new" for p in previous}, previous)
+        assert _log(vault) == [{"p": p, "h": "new"} for p in sorted(previous)]
+
+
+def test_null_hash_records_deletions():
+    with tempfile.TemporaryDirectory() as vault:
+        s = _syncer(vault)
+        s._load_state()
+        s._save_state({"a.md": "h1", "b.md": "h2", "c.md": "h3"}, {})
+        s = _syncer(vault)
+        previous = s._load_state()
+        s._save_state({"a.md": "h1", "c.md": "h3"}, previous)
+        assert _log(vault)[-1] == {"p": "b.md", "h": None}
+        assert _syncer(vault)._load_state() == {"a.md": "h1", "c.md": "h3"}
+
+
+def test_torn_and_malformed_lines_are_skipped_and_rewritten():
+    with tempfile.TemporaryDirectory() as vault:
+        (Path(vault) / SYNC_STATE_FILE).write_text(
+            '{"p": "a.md", "h": "h1"}\n'
+            "[1, 2]\n"
+            '{"h": "no path"}\n'
+            '{"p": "b.md", "h": 5}\n'
+            '{"p": "c.md", "h": "h3"}\n'
+            '{"p": "d.md", "h'  # interrupted append
+        )
+        s = _syncer(vault)
+        state = s._load_state()
+        assert state == {"a.md": "h1", "c.md": "h3"}
+
+        s._save_state({**state, "e.md": "h5"}, state)
+        assert _log(vault) == [{"p": "a.md", "h": "h1"}, {"p": "c.md", "h": "h3"}, {"p": "e.md", "h": "h5"}]
+
+
+def test_sync_survives_a_malformed_state_log():
+    with tempfile.TemporaryDirectory() as vault:
+        note = Path(vault) / "a.md"
+        note.write_text("note")
+        (Path(vault) / SYNC_STATE_FILE).write_text(
+            json.dumps({"p": "a.md", "h": GDriveSync._file_hash(note)}) + '\n"just a string"\n'
+        )
+        s = _syncer(vault)
+        s._service = mock.MagicMock()
+        assert s.sync() == {"uploaded": 0, "skipped": 1, "errors": 0}
+        assert len(_log(vault)) == 1
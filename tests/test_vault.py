@@ -39,6 +39,17 @@ def test_vault_dedup():
         assert path2 is None  # duplicate
 
 
+def test_vault_title_collisions():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        writer = VaultWriter(tmpdir)
+        first = writer.write(_make_doc(hash_val="a"))
+        # A note created behind the writer's back is still not overwritten
+        (first.parent / "Test_1.md").write_text("external")
+        second = writer.write(_make_doc(hash_val="b"))
+        third = VaultWriter(tmpdir).write(_make_doc(hash_val="c"))
+        assert [first.name, second.name, third.name] == ["Test.md", "Test_2.md", "Test_3.md"]
+
+
 def test_ontology_extract_entities():
     om = OntologyManager()
     entities = om.extract_entities("I met John Smith at [[Project Alpha]] yesterday.")
@@ -50,3 +61,70 @@ def test_ontology_folders():
     om = OntologyManager()
     assert "people" in om.get_entity_folder("Person")
     assert "documents" == om.get_entity_folder("Document")
+
+
+_FM = {"title": "Weekly Sync", "date": "2024-03-01", "tags": ["meeting", "team"]}
+_FM_TEXT = "---\ntitle: Weekly Sync\ndate: '2024-03-01'\ntags:\n- meeting\n- team\n---\n"
+
+
+def test_render_document_output():
+    from pkv.vault.templates import render_document
+
+    assert render_document("Weekly Sync", "Notes here.", _FM) == _FM_TEXT + "\n# Weekly Sync\n\nNotes here."
+    assert render_document("Weekly Sync", "Notes here.", _FM, ["Ada Lovelace", "Project X"]) == (
+        _FM_TEXT + "\n# Weekly Sync\n\nNotes here."
+        "\n\n\n## Related Entities\n\n- [[Ada Lovelace]]\n- [[Project X]]"
+    )
+
+
+def test_render_entity_page_output():
+    from pkv.vault.templates import render_entity_page
+
+    assert render_entity_page("Ada Lovelace", "Person", {}) == (
+        "---\ntitle: Ada Lovelace\ntype: Person\ntags:\n- person\n---\n"
+        "\n# 📄 Ada Lovelace\n\n**Type:** Person\n"
+    )
+    properties = {
+        "description": "Mathematician",
+        "related_entities": ["Charles Babbage"],
+        "source_documents": ["Weekly Sync"],
+        "context": "Mentioned twice",
+        "aliases": ["Ada", 1815],
+        "role": "Lead",
+        "empty": "",
+    }
+    assert render_entity_page("Ada Lovelace", "Person", properties, icon="👤") == (
+        "---\ntitle: Ada Lovelace\ntype: Person\ntags:\n- person\ndescription: Mathematician\n---\n"
+        "\n# 👤 Ada Lovelace\n\n**Type:** Person\n"
+        "\n## Description\n\nMathematician\n"
+        "\n## Related Entities\n\n- [[Charles Babbage]]\n"
+        "\n## Source Documents\n\n- [[Weekly Sync]]\n"
+        "\n## Context\n\nMentioned twice\n"
+        "\n## Aliases\n\n- [[Ada]]\n- 1815\n"
+        "\n**Role:** Lead\n"
+    )
+
+
+def test_render_frontmatter_returns_block():
+    from pkv.vault.templates import render_frontmatter
+
+    assert render_frontmatter(_FM) == _FM_TEXT
+
+
+def test_render_frontmatter_round_trips():
+    import yaml
+    from pkv.vault.templates import render_frontmatter
+
+    long_title = 'Q3 review: "what went wrong" — Ünïcode, colons: everywhere & it\'s long ' * 4
+    data = {
+        "title": long_title,
+        "escaped": "tab\there\r\nand a form feed\f" + "x" * 120,
+        "date": "2024-03-01",
+        "source": "/notes/a: b.md",
+        "content_hash": "0" * 64,
+        "tags": ["#hash", "key: value", "- dash", "yes", "null"],
+        "count": 3,
+    }
+    block = render_frontmatter(data)
+    assert block.startswith("---\n") and block.endswith("---\n")
+    assert yaml.safe_load(block[4:-4]) == data
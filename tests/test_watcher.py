@@ -0,0 +1,69 @@
+"""Tests for the watcher's event debouncing."""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("watchdog")
+
+from pkv.watcher import IngestHandler
+
+
+def _flush(handler, *paths):
+    handler._pending.update(str(p) for p in paths)
+    handler._flush()
+
+
+def test_unchanged_files_are_not_reprocessed():
+    batches = []
+    handler = IngestHandler()
+    handler.set_callback(batches.append)
+    with tempfile.TemporaryDirectory() as tmp:
+        note = Path(tmp) / "a.md"
+        note.write_text("x")
+        _flush(handler, note, Path(tmp) / "missing.md")
+        _flush(handler, note)  # e.g. a second modified event for the same save
+        note.write_text("xy")
+        _flush(handler, note)
+    assert batches == [[str(note)], [str(note)]]
+
+
+def test_failed_batches_and_files_are_retried():
+    calls = []
+
+    def crashing(paths):
+        calls.append(paths)
+        raise RuntimeError("API key rejected")
+
+    handler = IngestHandler()
+    handler.set_callback(crashing)
+    with tempfile.TemporaryDirectory() as tmp:
+        good, bad = Path(tmp) / "good.md", Path(tmp) / "bad.md"
+        good.write_text("g")
+        bad.write_text("b")
+        _flush(handler, good)
+        handler.set_callback(lambda paths: calls.append(paths) or [str(bad)])
+        _flush(handler, good, bad)
+        _flush(handler, good, bad)
+    assert calls[0] == [str(good)]
+    assert sorted(calls[1]) == sorted([str(good), str(bad)])
+    assert calls[2] == [str(bad)]
+
+
+def test_deleted_files_are_forgotten():
+    from watchdog.events import FileDeletedEvent
+
+    handler = IngestHandler()
+    handler.set_callback(lambda paths: None)
+    with tempfile.TemporaryDirectory() as tmp:
+        first, second = Path(tmp) / "a.md", Path(tmp) / "b.md"
+        first.write_text("x")
+        second.write_text("y")
+        _flush(handler, first, second)
+        assert set(handler._last_seen) == {str(first), str(second)}
+        os.unlink(first)
+        _flush(handler, first)  # stale event for a file that's gone
+        handler.on_deleted(FileDeletedEvent(str(second)))
+    assert handler._last_seen == {}